@@ -0,0 +1,24 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        "pk",
+        "task",
+        "status",
+        "priority",
+        "run_at",
+        "attempts",
+    )
+    list_filter = ("status", "task")
+    actions = ("retry",)
+
+    @admin.action(description="Выполнить ещё раз")
+    def retry(self, request, queryset):
+        queryset.update(
+            status=Job.QUEUED, attempts=0, run_at=timezone.now(), locked_by=""
+        )
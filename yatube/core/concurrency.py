@@ -0,0 +1,42 @@
+import asyncio
+import functools
+import weakref
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+_db_slots = weakref.WeakKeyDictionary()
+
+
+def _slots():
+    # Семафор привязан к циклу событий, поэтому заводим его на каждый цикл.
+    loop = asyncio.get_running_loop()
+    if loop not in _db_slots:
+        _db_slots[loop] = asyncio.Semaphore(settings.ASYNC_DB_CONCURRENCY)
+    return _db_slots[loop]
+
+
+async def run_db(func, *args, **kwargs):
+    """Выполняет блокирующий код (ORM, рендеринг) в потоке запроса.
+
+    Одновременно работает не больше ASYNC_DB_CONCURRENCY таких вызовов,
+    остальные ждут в цикле событий, не занимая потоков.
+    """
+    async with _slots():
+        return await sync_to_async(func, thread_sensitive=True)(
+            *args, **kwargs
+        )
+
+
+def async_view(view):
+    """Делает из синхронного представления асинхронное.
+
+    Декораторы Django 3.2 (cache_page, login_required) не умеют работать с
+    корутинами, поэтому они остаются на синхронной функции под этим
+    декоратором.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await run_db(view, request, *args, **kwargs)
+
+    return wrapper
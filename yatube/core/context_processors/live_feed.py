@@ -0,0 +1,8 @@
+from django.conf import settings
+
+
+def live_feed(request):
+    """Включена ли живая лента: она работает только под ASGI."""
+    return {
+        "live_feed_enabled": settings.LIVE_FEED_ENABLED,
+    }
@@ -0,0 +1,69 @@
+import logging
+
+from django.conf import settings
+from PIL import features
+from sorl.thumbnail import default
+from sorl.thumbnail.images import ImageFile
+from sorl.thumbnail.shortcuts import get_thumbnail
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_FORMAT = "JPEG"
+WEBP_FORMAT = "WEBP"
+
+
+def variant_formats():
+    """Форматы вариантов: WebP, если его умеет Pillow, и запасной JPEG."""
+    if features.check("webp"):
+        return (WEBP_FORMAT, FALLBACK_FORMAT)
+    return (FALLBACK_FORMAT,)
+
+
+def variant_geometry(width):
+    ratio_width, ratio_height = settings.POST_IMAGE_RATIO
+    return f"{width}x{round(width * ratio_height / ratio_width)}"
+
+
+def _source_width(image):
+    source = default.kvstore.get(ImageFile(image))
+    if source is None:
+        return None
+    return source.width
+
+
+def image_variants(image, image_format=FALLBACK_FORMAT):
+    """Возвращает список пар (ширина, миниатюра) для картинки поста.
+
+    Варианты шире исходной картинки не создаются: растягивать её ради
+    srcset бессмысленно, браузер и так выберет наибольший доступный.
+    """
+    variants = []
+    source_width = None
+    for width in sorted(settings.POST_IMAGE_WIDTHS):
+        if source_width and width > source_width:
+            break
+        thumbnail = get_thumbnail(
+            image,
+            variant_geometry(width),
+            crop="center",
+            upscale=True,
+            format=image_format,
+            quality=settings.POST_IMAGE_QUALITY,
+        )
+        if not variants:
+            # Размер исходника sorl кладёт в kvstore при первой миниатюре.
+            source_width = _source_width(image)
+        variants.append((width, thumbnail))
+    return variants
+
+
+def precompute_variants(image):
+    """Заранее создаёт все варианты картинки, чтобы первый просмотр ленты
+    не тратил время на ресайз."""
+    if not image:
+        return
+    for image_format in variant_formats():
+        try:
+            image_variants(image, image_format)
+        except Exception:
+            logger.exception("Не удалось подготовить варианты %s", image)
@@ -0,0 +1,127 @@
+import logging
+import os
+import socket
+import traceback
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def task_path(task):
+    if isinstance(task, str):
+        return task
+    return f"{task.__module__}.{task.__qualname__}"
+
+
+def enqueue(task, *args, priority=0, run_at=None, **kwargs):
+    """Ставит вызов task(*args, **kwargs) в очередь.
+
+    task — функция уровня модуля или путь к ней, аргументы должны
+    сериализоваться в JSON. Запись попадает в ту же транзакцию, что и
+    запрос, поэтому обработчик увидит задачу только после её фиксации.
+    """
+    return Job.objects.create(
+        task=task_path(task),
+        args=list(args),
+        kwargs=kwargs,
+        priority=priority,
+        run_at=run_at or timezone.now(),
+    )
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _ready(now):
+    # Задачи упавшего обработчика возвращаются в работу по тайм-ауту.
+    return Q(status=Job.QUEUED, run_at__lte=now) | Q(
+        status=Job.RUNNING, locked_at__lt=now - settings.JOBS_LOCK_TIMEOUT
+    )
+
+
+def claim(worker, batch_size=None):
+    """Забирает порцию готовых задач в работу обработчику worker.
+
+    Где база умеет SELECT ... FOR UPDATE SKIP LOCKED, обработчики не
+    ждут друг друга на одних и тех же строках. В SQLite записи и так
+    идут по одной, а повторная проверка условия в UPDATE не даёт двум
+    обработчикам взять одну задачу.
+    """
+    batch_size = batch_size or settings.JOBS_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        candidates = Job.objects.filter(_ready(now)).order_by(
+            "-priority", "run_at"
+        )
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return []
+        Job.objects.filter(_ready(now), id__in=ids).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now
+        )
+    return list(
+        Job.objects.filter(locked_by=worker, locked_at=now).order_by(
+            "-priority", "run_at"
+        )
+    )
+
+
+def retry_delay(attempts):
+    delay = settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1)
+    return min(delay, settings.JOBS_RETRY_MAX_DELAY)
+
+
+def run(job):
+    """Выполняет задачу. Удачная удаляется, упавшая откладывается с
+    экспоненциально растущей паузой или помечается невыполненной."""
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        logger.exception("Задача %s упала", job)
+        _fail(job, traceback.format_exc())
+        return False
+    Job.objects.filter(id=job.id, locked_by=job.locked_by).delete()
+    return True
+
+
+def _fail(job, error):
+    attempts = job.attempts + 1
+    changes = {"attempts": attempts, "last_error": error, "locked_by": ""}
+    if attempts >= job.max_attempts:
+        changes["status"] = Job.FAILED
+    else:
+        changes["status"] = Job.QUEUED
+        changes["run_at"] = timezone.now() + retry_delay(attempts)
+    Job.objects.filter(id=job.id, locked_by=job.locked_by).update(**changes)
+
+
+def run_pending(batch_size=None, worker=None):
+    """Выполняет готовые задачи, пока они есть. Возвращает число
+    выполненных, включая упавшие."""
+    worker = worker or worker_name()
+    done = 0
+    while True:
+        jobs = claim(worker, batch_size)
+        if not jobs:
+            return done
+        for job in jobs:
+            run(job)
+        done += len(jobs)
+
+
+def next_run_at():
+    """Время ближайшей отложенной задачи или None."""
+    return Job.objects.filter(status=Job.QUEUED).order_by(
+        "run_at"
+    ).values_list("run_at", flat=True).first()
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Engine, engines
+
+from core.template_cache import template_names
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время загрузки шаблонов проекта без кэша и с "
+        "кэширующим загрузчиком после прогрева."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=100)
+
+    def handle(self, *args, **options):
+        engine = engines["django"].engine
+        names = list(template_names(engine))
+        loaders = [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ]
+        params = {
+            "dirs": engine.dirs,
+            "libraries": engine.libraries,
+            "builtins": engine.builtins,
+            "debug": engine.debug,
+            "string_if_invalid": engine.string_if_invalid,
+        }
+        plain = Engine(loaders=loaders, **params)
+        cached = Engine(
+            loaders=[("django.template.loaders.cached.Loader", loaders)],
+            **params,
+        )
+        for name in names:
+            cached.get_template(name)
+        iterations = options["iterations"]
+        self.stdout.write(f"Шаблонов: {len(names)}, повторов: {iterations}.")
+        for label, bench_engine in (("без кэша", plain), ("с кэшем", cached)):
+            elapsed = self.measure(bench_engine, names, iterations)
+            self.stdout.write(
+                f"{label}: {elapsed * 1000 / iterations:.3f} мс "
+                "на загрузку всех шаблонов"
+            )
+
+    def measure(self, engine, names, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for name in names:
+                engine.get_template(name)
+        return time.perf_counter() - started
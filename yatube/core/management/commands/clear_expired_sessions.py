@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core import sessions
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет просроченные сессии небольшими порциями. Для движков, "
+        "которые не хранят сессии в БД, ничего не делает."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, **options):
+        cleared = sessions.clear_expired(options["batch_size"])
+        self.stdout.write(f"Удалено сессий: {cleared}.")
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Выполняет задачи из очереди. С --loop работает постоянно и спит, "
+        "пока задач нет."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а ждать новых задач.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Наибольшая пауза между проверками в режиме --loop, сек.",
+        )
+
+    def handle(self, *args, **options):
+        worker = jobs.worker_name()
+        while True:
+            done = jobs.run_pending(options["batch_size"], worker)
+            if done:
+                self.stdout.write(f"Выполнено задач: {done}.")
+            if not options["loop"]:
+                return
+            time.sleep(self.pause(options["interval"]))
+
+    def pause(self, interval):
+        upcoming = jobs.next_run_at()
+        if upcoming is None:
+            return interval
+        seconds = (upcoming - timezone.now()).total_seconds()
+        return min(interval, max(seconds, 0))
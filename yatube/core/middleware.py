@@ -0,0 +1,44 @@
+import gzip
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware as BaseGZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+re_accepts_gzip = _lazy_re_compile(r"\bgzip\b")
+
+
+class GZipMiddleware(BaseGZipMiddleware):
+    """Сжатие HTML с настраиваемым уровнем.
+
+    В отличие от встроенного не трогает потоковые ответы, включая
+    server-sent events, которые нельзя буферизовать, и типы из
+    GZIP_EXCLUDED_TYPES, которые уже сжаты.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header("Content-Encoding"):
+            return response
+        if len(response.content) < settings.GZIP_MIN_LENGTH:
+            return response
+        content_type = response.get("Content-Type", "").split(";")[0]
+        if content_type.startswith(settings.GZIP_EXCLUDED_TYPES):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if not re_accepts_gzip.search(accept_encoding):
+            return response
+
+        compressed = gzip.compress(
+            response.content, compresslevel=settings.GZIP_LEVEL, mtime=0
+        )
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = "gzip"
+        return response
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+def default_max_attempts():
+    return settings.JOBS_MAX_ATTEMPTS
+
+
+class Job(models.Model):
+    """Отложенная задача: путь к функции и её аргументы в JSON."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUSES = (
+        (QUEUED, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (FAILED, "Не выполнена"),
+    )
+
+    task = models.CharField(max_length=200, verbose_name="Задача")
+    args = models.JSONField(default=list, verbose_name="Аргументы")
+    kwargs = models.JSONField(
+        default=dict, verbose_name="Именованные аргументы"
+    )
+    priority = models.SmallIntegerField(
+        default=0,
+        verbose_name="Приоритет",
+        help_text="Задачи с большим приоритетом выполняются раньше",
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=QUEUED,
+        verbose_name="Состояние",
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now, verbose_name="Выполнить не раньше"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Попыток"
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=default_max_attempts, verbose_name="Наибольшее число попыток"
+    )
+    locked_by = models.CharField(
+        max_length=64, blank=True, verbose_name="Обработчик"
+    )
+    locked_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Взята в работу"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    created = models.DateTimeField(auto_now_add=True, verbose_name="Создана")
+
+    class Meta:
+        ordering = ("-priority", "run_at")
+        verbose_name = "Задача"
+        verbose_name_plural = "Задачи"
+        indexes = [
+            # Выбор готовых задач — диапазон по одному индексу.
+            models.Index(fields=("status", "-priority", "run_at")),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.pk}"
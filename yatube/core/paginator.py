@@ -0,0 +1,88 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.db import connection, models
+from django.db.models import Max, Min
+from django.utils.functional import cached_property
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который помнит COUNT(*) запроса PAGINATOR_COUNT_TIMEOUT
+    секунд.
+
+    Для списков в админке точное число строк не важно, а пересчитывать
+    большую таблицу на каждой странице дорого.
+    """
+
+    @cached_property
+    def count(self):
+        try:
+            sql, params = self.object_list.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        digest = hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+        key = f"paginator-count:{digest}"
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, settings.PAGINATOR_COUNT_TIMEOUT)
+        return count
+
+
+def estimate_rows(model):
+    """Примерное число строк таблицы модели без её полного просмотра.
+
+    PostgreSQL и MySQL хранят оценку в статистике, в SQLite её заменяет
+    разница крайних значений целочисленного первичного ключа. None, если
+    оценить нельзя.
+    """
+    table = model._meta.db_table
+    vendor = connection.vendor
+    if vendor == "postgresql":
+        sql = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass"
+    elif vendor == "mysql":
+        sql = (
+            "SELECT table_rows FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name = %s"
+        )
+    elif isinstance(model._meta.pk, models.AutoField):
+        bounds = model._base_manager.aggregate(
+            low=Min("pk"), high=Max("pk")
+        )
+        if bounds["low"] is None:
+            return 0
+        return bounds["high"] - bounds["low"] + 1
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    # Таблица без собранной статистики в PostgreSQL даёт -1.
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class ApproximateCountPaginator(CachedCountPaginator):
+    """Точное число строк до PAGINATOR_COUNT_THRESHOLD, дальше — оценка.
+
+    Подсчёт ограничен LIMIT и не читает больше порога строк. Больший
+    список без фильтров оценивается по статистике таблицы, с фильтрами —
+    считается честно, но не чаще раза в PAGINATOR_COUNT_TIMEOUT.
+    """
+
+    @cached_property
+    def count(self):
+        threshold = settings.PAGINATOR_COUNT_THRESHOLD
+        queryset = self.object_list
+        bounded = queryset.order_by()[:threshold + 1].count()
+        if bounded <= threshold:
+            return bounded
+        if not queryset.query.where:
+            estimate = estimate_rows(queryset.model)
+            if estimate is not None:
+                return max(estimate, bounded)
+        return super().count
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+
+class AsyncSubscription:
+    """Подписка для асинхронного кода, можно наполнять из любого потока."""
+
+    def __init__(self, accepts, maxsize=100):
+        self.accepts = accepts
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=maxsize)
+
+    def _put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Медленный клиент теряет уведомления, а не память процесса.
+            pass
+
+    def deliver(self, message):
+        if self.accepts(message):
+            self._loop.call_soon_threadsafe(self._put, message)
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """Простейший pub/sub внутри процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.deliver(message)
@@ -0,0 +1,37 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+def session_model():
+    """Модель сессий текущего движка или None, если он хранит их не в БД."""
+    engine = import_module(settings.SESSION_ENGINE)
+    get_model_class = getattr(engine.SessionStore, "get_model_class", None)
+    return get_model_class() if get_model_class else None
+
+
+def clear_expired(batch_size=None):
+    """Удаляет просроченные сессии порциями.
+
+    Каждая порция — отдельная короткая транзакция, чтобы не держать
+    блокировку таблицы, пока идут запросы пользователей. Возвращает число
+    удалённых сессий.
+    """
+    model = session_model()
+    if model is None:
+        return 0
+    batch_size = batch_size or settings.SESSION_CLEANUP_BATCH_SIZE
+    now = timezone.now()
+    cleared = 0
+    while True:
+        keys = list(
+            model.objects.filter(expire_date__lt=now).values_list(
+                "session_key", flat=True
+            )[:batch_size]
+        )
+        if not keys:
+            return cleared
+        with transaction.atomic():
+            cleared += model.objects.filter(session_key__in=keys).delete()[0]
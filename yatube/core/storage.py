@@ -0,0 +1,58 @@
+import gzip
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен, тогда будут только .gz
+    brotli = None
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшем содержимого в имени и сжатыми копиями рядом.
+
+    После collectstatic для каждого хэшированного текстового файла
+    появляются name.gz и, если установлен brotli, name.br, сжатые с
+    наибольшей степенью: сжимаем один раз при сборке, а не на каждый
+    запрос.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = {}
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names[name] = hashed_name
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in hashed_names.values():
+            self.compress(hashed_name)
+
+    def compress(self, name):
+        if not name.endswith(settings.STATIC_COMPRESS_EXTENSIONS):
+            return
+        with self.open(name) as source:
+            data = source.read()
+        if len(data) < settings.STATIC_COMPRESS_MIN_SIZE:
+            return
+        encoders = [(".gz", _gzip)]
+        if brotli is not None:
+            encoders.append((".br", _brotli))
+        for suffix, encode in encoders:
+            compressed = encode(data)
+            # Несжимаемые файлы оставляем как есть.
+            if len(compressed) >= len(data):
+                continue
+            with open(self.path(name) + suffix, "wb") as target:
+                target.write(compressed)
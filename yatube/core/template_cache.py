@@ -0,0 +1,43 @@
+import logging
+import os
+
+from django.template import TemplateSyntaxError, engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+logger = logging.getLogger(__name__)
+
+
+def template_names(engine):
+    """Имена всех шаблонов из каталогов DIRS движка."""
+    for directory in engine.dirs:
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, directory).replace(os.sep, "/")
+
+
+def is_cached(engine):
+    return any(
+        isinstance(loader, CachedLoader) for loader in engine.template_loaders
+    )
+
+
+def warm_up(alias="django"):
+    """Заранее компилирует шаблоны проекта в кэширующий загрузчик.
+
+    Вызывается при старте процесса, чтобы первые запросы не платили за
+    чтение и разбор шаблонов. Без кэширующего загрузчика ничего не
+    делает. Возвращает число скомпилированных шаблонов.
+    """
+    engine = engines[alias].engine
+    if not is_cached(engine):
+        return 0
+    compiled = 0
+    for name in template_names(engine):
+        try:
+            engine.get_template(name)
+        except TemplateSyntaxError:
+            logger.exception("Не удалось скомпилировать шаблон %s", name)
+            continue
+        compiled += 1
+    return compiled
@@ -0,0 +1,45 @@
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+
+def _page_url(request, number):
+    if request is None:
+        return f"?page={number}"
+    # Остальные параметры запроса (фильтры, размер страницы) сохраняются.
+    query = request.GET.copy()
+    query["page"] = number
+    return f"?{query.urlencode()}"
+
+
+@register.inclusion_tag("includes/paginator.html", takes_context=True)
+def paginator(context, page_obj):
+    """Выводит окно страниц: края, соседи текущей и многоточия.
+
+    Число ссылок не зависит от общего числа страниц.
+    """
+    request = context.get("request")
+    paginator = page_obj.paginator
+    pages = []
+    for number in paginator.get_elided_page_range(
+        page_obj.number,
+        on_each_side=settings.PAGINATOR_ON_EACH_SIDE,
+        on_ends=settings.PAGINATOR_ON_ENDS,
+    ):
+        if number == paginator.ELLIPSIS:
+            pages.append({"ellipsis": number})
+            continue
+        pages.append({
+            "number": number,
+            "url": _page_url(request, number),
+            "current": number == page_obj.number,
+        })
+    context = {"page_obj": page_obj, "pages": pages}
+    if page_obj.has_previous():
+        context["previous_url"] = _page_url(
+            request, page_obj.previous_page_number()
+        )
+    if page_obj.has_next():
+        context["next_url"] = _page_url(request, page_obj.next_page_number())
+    return context
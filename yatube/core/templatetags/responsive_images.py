@@ -0,0 +1,48 @@
+import logging
+
+from django import template
+from django.conf import settings
+
+from core.images import FALLBACK_FORMAT, image_variants, variant_formats
+
+logger = logging.getLogger(__name__)
+
+register = template.Library()
+
+
+def _srcset(variants):
+    return ", ".join(f"{thumb.url} {width}w" for width, thumb in variants)
+
+
+@register.inclusion_tag("includes/responsive_image.html")
+def responsive_image(image, sizes=None, css="card-img my-2"):
+    """Выводит <picture> с srcset из заранее подготовленных вариантов."""
+    context = {"sources": [], "img": None, "sizes": None, "css": css}
+    if not image:
+        return context
+    try:
+        for image_format in variant_formats():
+            variants = image_variants(image, image_format)
+            if image_format != FALLBACK_FORMAT:
+                context["sources"].append({
+                    "type": f"image/{image_format.lower()}",
+                    "srcset": _srcset(variants),
+                })
+                continue
+            default_thumb = variants[-1][1]
+            for width, thumb in variants:
+                if width >= settings.POST_IMAGE_DEFAULT_WIDTH:
+                    default_thumb = thumb
+                    break
+            context["img"] = {
+                "src": default_thumb.url,
+                "srcset": _srcset(variants),
+                "width": default_thumb.width,
+                "height": default_thumb.height,
+            }
+    except Exception:
+        logger.exception("Не удалось вывести картинку %s", image)
+        context["sources"], context["img"] = [], None
+        return context
+    context["sizes"] = sizes or settings.POST_IMAGE_SIZES
+    return context
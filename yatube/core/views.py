@@ -1,4 +1,29 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified)
 from django.shortcuts import render
+from django.utils._os import safe_join
+from django.utils.cache import (get_conditional_response,
+                                patch_cache_control, patch_vary_headers)
+from django.utils.encoding import iri_to_uri
+from django.utils.http import http_date, quote_etag
+from django.utils.regex_helper import _lazy_re_compile
+from django.views.static import was_modified_since
+
+# Имя с хэшем содержимого от ManifestStaticFilesStorage: app.1a2b3c4d5e6f.css
+HASHED_NAME = _lazy_re_compile(r'\.[0-9a-f]{12}\.\w+$')
+
+PRECOMPRESSED = (
+    ('br', '.br', _lazy_re_compile(r'\bbr\b')),
+    ('gzip', '.gz', _lazy_re_compile(r'\bgzip\b')),
+)
+
+# Поддерживается один диапазон: bytes=0-99, bytes=100- или bytes=-100.
+BYTE_RANGE = _lazy_re_compile(r'^bytes=(\d*)-(\d*)$')
 
 
 def server_error(request):
@@ -11,3 +36,158 @@ def page_not_found(request, exception):
 
 def csrf_failure(request, reason=''):
     return render(request, 'core/403csrf.html')
+
+
+def static_file(request, path):
+    """Отдаёт собранную статику, выбирая заранее сжатую копию.
+
+    Файлы с хэшем в имени никогда не меняются, поэтому кэшируются
+    браузером на STATIC_HASHED_MAX_AGE и не перепроверяются.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    content_type, _ = mimetypes.guess_type(full_path)
+    accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    encoding = None
+    for name, suffix, accepts in PRECOMPRESSED:
+        if (accepts.search(accept_encoding)
+                and os.path.isfile(full_path + suffix)):
+            full_path += suffix
+            encoding = name
+            break
+    stat = os.stat(full_path)
+    if not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime
+    ):
+        return HttpResponseNotModified()
+    response = FileResponse(
+        open(full_path, 'rb'),
+        content_type=content_type or 'application/octet-stream',
+    )
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if HASHED_NAME.search(path):
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.STATIC_HASHED_MAX_AGE,
+            immutable=True,
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.STATIC_MAX_AGE
+        )
+    return response
+
+
+class RangeFile:
+    """Часть файла для ответа 206: читает не больше length байт."""
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Границы (start, end) из заголовка Range или None, если он
+    непонятен. Для недостижимого диапазона — ValueError."""
+    match = BYTE_RANGE.match(header)
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(header)
+    return start, end
+
+
+def media_file(request, path):
+    """Отдаёт загруженный файл, по возможности руками веб-сервера.
+
+    С MEDIA_SENDFILE_HEADER ответ пустой, а файл отправляет nginx
+    (X-Accel-Redirect) или Apache (X-Sendfile). Иначе файл идёт через
+    FileResponse: целиком — через wsgi.file_wrapper, то есть sendfile
+    без копирования, а по заголовку Range — нужной частью.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+    etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        response = _media_response(request, full_path, path, stat, etag)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    patch_cache_control(response, public=True, max_age=settings.MEDIA_MAX_AGE)
+    return response
+
+
+def _media_response(request, full_path, path, stat, etag):
+    content_type, _ = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    header = settings.MEDIA_SENDFILE_HEADER
+    if header:
+        response = HttpResponse(content_type=content_type)
+        if header == 'X-Accel-Redirect':
+            response[header] = iri_to_uri(
+                settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+            )
+        else:
+            response[header] = full_path
+        return response
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE', '')
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (if_range is None or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+    file = open(full_path, 'rb')
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            RangeFile(file, start, length),
+            content_type=content_type,
+            status=206,
+        )
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
@@ -1,6 +1,21 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.template.response import TemplateResponse
 
-from .models import Follow, Group, Comment, Post
+from core.paginator import ApproximateCountPaginator
+
+from . import deletion, profiles, spam, trending
+from .models import Follow, Group, Comment, Post, Tag, User
+
+
+class MoveToGroupForm(forms.Form):
+    group = forms.ModelChoiceField(
+        Group.objects.all(),
+        required=False,
+        empty_label="Без группы",
+        label="Группа",
+    )
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -10,14 +25,144 @@ class PostAdmin(admin.ModelAdmin):
         "pub_date",
         "author",
         "group",
+        "duplicate_of",
     )
     list_editable = ("group",)
+    list_select_related = ("author", "group", "duplicate_of")
     search_fields = ("text",)
-    list_filter = ("pub_date",)
+    list_filter = (
+        "pub_date",
+        "status",
+        ("duplicate_of", admin.EmptyFieldListFilter),
+    )
     empty_value_display = "-пусто-"
+    paginator = ApproximateCountPaginator
+    # Второй подсчёт, всей таблицы без фильтров, не нужен.
+    show_full_result_count = False
+    actions = ("move_to_group", "soft_delete", "ban_authors", "not_spam")
+
+    def get_queryset(self, request):
+        # Модераторам видны и удалённые записи, пока их не стёрли.
+        return Post.all_objects.all()
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == "group":
+            # Список групп выбирается один раз на страницу, а не в каждой
+            # строке list_editable.
+            field.choices = list(field.choices)
+        return field
+
+    def get_actions(self, request):
+        # Стандартное удаление загружает каждую запись со всеми
+        # комментариями; вместо него записи скрываются, а стирает их
+        # purge_posts.
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    @admin.action(description="Перенести в группу")
+    def move_to_group(self, request, queryset):
+        form = MoveToGroupForm(
+            request.POST if "apply" in request.POST else None
+        )
+        if form.is_valid():
+            group = form.cleaned_data["group"]
+            group_ids = set(
+                queryset.order_by().values_list("group_id", flat=True)
+            )
+            moved = queryset.update(group=group)
+            # UPDATE не проходит через сигналы, поэтому рейтинги старых и
+            # новой группы пересчитываются явно.
+            group_ids.add(group and group.pk)
+            group_ids.discard(None)
+            trending.rebuild_groups(group_ids)
+            self.message_user(request, f"Перенесено записей: {moved}.")
+            return None
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Перенести записи в группу",
+            "opts": self.model._meta,
+            "form": form,
+            "count": queryset.count(),
+            "selected": request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            "select_across": request.POST.get("select_across", "0"),
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(
+            request, "admin/posts/post/move_to_group.html", context
+        )
+
+    @admin.action(description="Удалить (можно восстановить)")
+    def soft_delete(self, request, queryset):
+        removed = deletion.soft_delete_many(queryset)
+        self.message_user(request, f"Удалено записей: {removed}.")
+
+    @admin.action(description="Заблокировать авторов и скрыть их записи")
+    def ban_authors(self, request, queryset):
+        author_ids = set(
+            queryset.order_by().values_list("author_id", flat=True)
+        )
+        authors = User.objects.filter(
+            id__in=author_ids, is_superuser=False
+        ).exclude(id=request.user.pk)
+        author_ids = list(authors.values_list("id", flat=True))
+        banned = authors.update(is_active=False)
+        removed = deletion.soft_delete_many(
+            Post.all_objects.filter(author_id__in=author_ids)
+        )
+        profiles.invalidate(*author_ids)
+        self.message_user(
+            request,
+            f"Заблокировано авторов: {banned}, скрыто записей: {removed}.",
+            messages.WARNING,
+        )
+
+    @admin.action(description="Не спам: вернуть в ленты")
+    def not_spam(self, request, queryset):
+        posts = queryset.filter(status=Post.SPAM)
+        for post in posts:
+            spam.approve(post)
+        self.message_user(request, f"Возвращено записей: {len(posts)}.")
+
+
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ("pk", "text", "created", "author", "post", "is_spam")
+    list_select_related = ("author", "post")
+    raw_id_fields = ("author", "post")
+    list_filter = ("created", "is_spam")
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    actions = ("not_spam",)
+
+    def get_queryset(self, request):
+        return Comment.all_objects.all()
+
+    @admin.action(description="Не спам: показать комментарии")
+    def not_spam(self, request, queryset):
+        comments = queryset.filter(is_spam=True).select_related("post")
+        for comment in comments:
+            spam.approve(comment)
+        self.message_user(
+            request, f"Возвращено комментариев: {len(comments)}."
+        )
+
+
+class FollowAdmin(admin.ModelAdmin):
+    list_display = ("pk", "user", "author")
+    list_select_related = ("user", "author")
+    raw_id_fields = ("user", "author")
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+
+class TagAdmin(admin.ModelAdmin):
+    list_display = ("pk", "name")
+    search_fields = ("name",)
 
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group)
-admin.site.register(Comment)
-admin.site.register(Follow)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(Follow, FollowAdmin)
+admin.site.register(Tag, TagAdmin)
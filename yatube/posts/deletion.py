@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from sorl.thumbnail import default
+
+from . import profiles, stats
+from .models import Comment, Post
+
+
+def soft_delete(post):
+    """Скрывает запись из всех лент одним UPDATE без каскада.
+
+    Черновики и отложенные записи никто, кроме автора, не видел и
+    прокомментировать не мог, их дешевле удалить сразу.
+    """
+    if not post.is_published:
+        post.delete()
+        return
+    post.status = Post.DELETED
+    post.deleted_at = timezone.now()
+    post.save(update_fields=("status", "deleted_at"))
+    stats.record_post(post, -1)
+
+
+def soft_delete_many(posts):
+    """Скрывает записи из queryset несколькими UPDATE, не загружая их.
+
+    Возвращает число скрытых и удалённых записей.
+    """
+    posts = posts.order_by()
+    author_ids = set(posts.values_list("author_id", flat=True).distinct())
+    _, deleted = posts.filter(
+        status__in=(Post.DRAFT, Post.SCHEDULED)
+    ).delete()
+    published = posts.filter(status=Post.PUBLISHED)
+    with transaction.atomic():
+        stats.record_hidden_posts(published)
+        hidden = published.update(
+            status=Post.DELETED, deleted_at=timezone.now()
+        )
+    profiles.invalidate(*author_ids)
+    return hidden + deleted.get("posts.Post", 0)
+
+
+def restore(post):
+    post.status = Post.PUBLISHED
+    post.deleted_at = None
+    post.save(update_fields=("status", "deleted_at"))
+    stats.record_post(post)
+
+
+def _delete_comments(post_ids, batch_size):
+    # Большие обсуждения стираются порциями, чтобы не держать блокировку
+    # записи в базе на время одного огромного DELETE.
+    while True:
+        ids = list(
+            Comment.all_objects.filter(post_id__in=post_ids).values_list(
+                "id", flat=True
+            )[:batch_size]
+        )
+        if not ids:
+            return
+        with transaction.atomic():
+            Comment.all_objects.filter(id__in=ids).delete()
+
+
+def _delete_images(post_ids, names):
+    if not names:
+        return
+    shared = set(
+        Post.all_objects.filter(image__in=names).exclude(
+            id__in=post_ids
+        ).values_list("image", flat=True)
+    )
+    for name in set(names) - shared:
+        default.backend.delete(name)
+
+
+def purge(batch_size=None):
+    """Окончательно стирает записи, удалённые раньше окна восстановления,
+    вместе с комментариями и картинками. Возвращает число записей."""
+    batch_size = batch_size or settings.POST_PURGE_BATCH_SIZE
+    expired = Post.all_objects.filter(
+        status=Post.DELETED,
+        deleted_at__lt=timezone.now() - settings.POST_RESTORE_WINDOW
+    ).order_by("id")
+    purged = 0
+    while True:
+        rows = list(expired.values_list("id", "image")[:batch_size])
+        if not rows:
+            return purged
+        post_ids = [post_id for post_id, _ in rows]
+        _delete_comments(post_ids, batch_size)
+        with transaction.atomic():
+            Post.all_objects.filter(id__in=post_ids).delete()
+        _delete_images(post_ids, [image for _, image in rows if image])
+        purged += len(rows)
@@ -0,0 +1,121 @@
+from django.conf import settings
+from django.db import transaction
+
+from . import similarity
+from .models import Post, PostBucket, PostSignature
+
+
+def similar(sig, exclude=None):
+    """Id записей, похожих на подпись sig не меньше DUPLICATE_THRESHOLD.
+
+    Кандидаты — записи из общих корзин, не больше DUPLICATE_CANDIDATES
+    самых новых; сходство уточняется по их подписям.
+    """
+    keys = similarity.bands(sig)
+    rows = PostBucket.objects.filter(
+        bucket__in=[bucket for _, bucket in keys]
+    ).exclude(post_id=exclude).order_by("-post_id").values_list(
+        "post_id", "band", "bucket"
+    )[:settings.DUPLICATE_CANDIDATES * len(keys)]
+    keys = set(keys)
+    candidates = {
+        post_id for post_id, band, bucket in rows if (band, bucket) in keys
+    }
+    signatures = PostSignature.objects.filter(
+        post_id__in=candidates
+    ).values_list("post_id", "data")
+    return [
+        post_id for post_id, data in signatures
+        if similarity.similarity(sig, similarity.unpack(data))
+        >= settings.DUPLICATE_THRESHOLD
+    ]
+
+
+def find_original(post, sig):
+    """Самая ранняя опубликованная запись автора, повтором которой
+    является post, или None."""
+    return Post.objects.filter(
+        pk__in=similar(sig, exclude=post.pk),
+        pk__lt=post.pk,
+        author_id=post.author_id,
+        duplicate_of__isnull=True,
+    ).order_by("pk").values_list("pk", flat=True).first()
+
+
+def _store(post_id, sig):
+    PostBucket.objects.filter(post_id=post_id).delete()
+    if sig is None:
+        PostSignature.objects.filter(post_id=post_id).delete()
+        return
+    PostSignature.objects.update_or_create(
+        post_id=post_id, defaults={"data": similarity.pack(sig)}
+    )
+    PostBucket.objects.bulk_create(
+        PostBucket(post_id=post_id, band=band, bucket=bucket)
+        for band, bucket in similarity.bands(sig)
+    )
+
+
+def index(post):
+    """Обновляет подпись и корзины записи и отмечает её повтором.
+
+    Если подпись не изменилась, в базу ничего не пишется.
+    """
+    sig = similarity.signature(post.text)
+    stored = PostSignature.objects.filter(post_id=post.pk).values_list(
+        "data", flat=True
+    ).first()
+    if sig is not None and stored is not None and (
+        similarity.unpack(stored) == sig
+    ):
+        return
+    if sig is None and stored is None:
+        return
+    with transaction.atomic():
+        _store(post.pk, sig)
+        original = find_original(post, sig) if sig is not None else None
+        Post.all_objects.filter(pk=post.pk).update(duplicate_of=original)
+    post.duplicate_of_id = original
+
+
+def backfill(batch_size=None, everything=False):
+    """Считает подписи записей, у которых их нет, порциями по
+    batch_size. Возвращает число обработанных записей."""
+    batch_size = batch_size or settings.DUPLICATE_BATCH_SIZE
+    posts = Post.all_objects.order_by("pk")
+    if not everything:
+        posts = posts.filter(signature__isnull=True)
+    done = 0
+    last = 0
+    while True:
+        batch = list(
+            posts.filter(pk__gt=last).only("pk", "text", "author_id")[
+                :batch_size
+            ]
+        )
+        if not batch:
+            return done
+        sigs = similarity.signatures(post.text for post in batch)
+        with transaction.atomic():
+            PostBucket.objects.filter(post__in=batch).delete()
+            PostSignature.objects.filter(post__in=batch).delete()
+            PostSignature.objects.bulk_create(
+                PostSignature(post=post, data=similarity.pack(sig))
+                for post, sig in zip(batch, sigs) if sig is not None
+            )
+            PostBucket.objects.bulk_create(
+                PostBucket(post=post, band=band, bucket=bucket)
+                for post, sig in zip(batch, sigs) if sig is not None
+                for band, bucket in similarity.bands(sig)
+            )
+            # Записи идут по возрастанию id, так что оригинал, если он
+            # есть, уже отмечен к моменту проверки его повтора.
+            for post, sig in zip(batch, sigs):
+                original = None
+                if sig is not None:
+                    original = find_original(post, sig)
+                Post.all_objects.filter(pk=post.pk).update(
+                    duplicate_of=original
+                )
+        done += len(batch)
+        last = batch[-1].pk
@@ -9,6 +9,34 @@ class PostForm(forms.ModelForm):
         fields = ("text", "group", "image")
 
 
+class PublicationForm(forms.ModelForm):
+    """Когда публиковать запись. Для уже опубликованных не показывается."""
+    draft = forms.BooleanField(
+        required=False,
+        label="Черновик",
+        help_text="Черновик видите только вы",
+    )
+
+    class Meta:
+        model = Post
+        fields = ("publish_at",)
+        widgets = {
+            "publish_at": forms.DateTimeInput(
+                attrs={"type": "datetime-local"}, format="%Y-%m-%dT%H:%M"
+            ),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["draft"].initial = self.instance.status == Post.DRAFT
+
+    def apply(self, post):
+        post.schedule(
+            self.cleaned_data.get("publish_at"),
+            self.cleaned_data.get("draft"),
+        )
+
+
 class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
@@ -0,0 +1,102 @@
+import json
+import re
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from .models import PostRevision
+
+TOKENS = re.compile(r"\s+|\w+|[^\w\s]")
+
+
+def _tokens(text):
+    return TOKENS.findall(text)
+
+
+def make_diff(old, new):
+    """Разница между текстами в виде [[начало, конец, вставка], ...].
+
+    Сравнение идёт по словам, а позиции хранятся в символах старого текста,
+    так что размер разницы пропорционален правке, а не длине записи.
+    """
+    old_tokens, new_tokens = _tokens(old), _tokens(new)
+    offsets = [0]
+    for token in old_tokens:
+        offsets.append(offsets[-1] + len(token))
+    matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    return [
+        [offsets[i1], offsets[i2], "".join(new_tokens[j1:j2])]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_diff(text, diff):
+    parts = []
+    position = 0
+    for start, end, insert in diff:
+        parts.append(text[position:start])
+        parts.append(insert)
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def _create(post, number, text, image, previous_text=None):
+    is_snapshot = (
+        previous_text is None
+        or (number - 1) % settings.POST_HISTORY_SNAPSHOT_EVERY == 0
+    )
+    if is_snapshot:
+        data = text
+    else:
+        data = json.dumps(make_diff(previous_text, text), ensure_ascii=False)
+    return PostRevision.objects.create(
+        post=post,
+        number=number,
+        is_snapshot=is_snapshot,
+        data=data,
+        image=image,
+    )
+
+
+def record_edit(post, old_text, old_image):
+    """Сохраняет правку записи. Вызывается после сохранения новой версии,
+    old_text и old_image - значения до правки.
+
+    Первая версия заводится только при первой правке, поэтому записи,
+    которые никто не редактировал, места в истории не занимают.
+    """
+    new_image = post.image.name or ""
+    if old_text == post.text and old_image == new_image:
+        return
+    with transaction.atomic():
+        last = post.revisions.aggregate(last=Max("number"))["last"]
+        if last is None:
+            _create(post, 1, old_text, old_image)
+            last = 1
+        _create(post, last + 1, post.text, new_image, old_text)
+
+
+def revision_text(post, number):
+    """Текст версии number: последний полный текст до неё и не больше
+    POST_HISTORY_SNAPSHOT_EVERY - 1 разниц после него. None, если такой
+    версии нет."""
+    if not post.revisions.filter(number=number).exists():
+        return None
+    snapshot = post.revisions.filter(
+        number__lte=number, is_snapshot=True
+    ).aggregate(number=Max("number"))["number"]
+    if snapshot is None:
+        return None
+    text = None
+    for revision in post.revisions.filter(
+        number__gte=snapshot, number__lte=number
+    ):
+        if revision.is_snapshot:
+            text = revision.data
+        else:
+            text = apply_diff(text, json.loads(revision.data))
+    return text
@@ -0,0 +1,232 @@
+import asyncio
+import io
+import json
+import logging
+import threading
+import time
+from collections import deque
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib import auth
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.asgi import ASGIRequest
+from django.db import close_old_connections
+from django.db.models import Q
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from core.concurrency import run_db
+from core.pubsub import AsyncSubscription, Broker
+
+from .models import Follow, Group, Post
+
+logger = logging.getLogger(__name__)
+
+broker = Broker()
+
+RETRY = "retry: 3000\n\n"
+HEARTBEAT = ": ping\n\n"
+SSE_HEADERS = (
+    (b"content-type", b"text/event-stream"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+)
+
+_recent_lock = threading.Lock()
+_recent_ids = deque(maxlen=1000)
+
+
+def _publish(post_id, author_id, group_slug):
+    broker.publish({
+        "id": post_id,
+        "author": author_id,
+        "group": group_slug,
+    })
+
+
+def publish_post(post):
+    """Рассылает запись, сохранённую в этом процессе."""
+    with _recent_lock:
+        _recent_ids.append(post.pk)
+    group_slug = post.group.slug if post.group_id else None
+    _publish(post.pk, post.author_id, group_slug)
+
+
+def _publish_polled(post_id, author_id, group_slug):
+    # Записи этого процесса уже разосланы сигналом, а опрос видит одну и ту
+    # же запись несколько раз, пока она не выйдет из окна LIVE_FEED_POLL_LAG.
+    with _recent_lock:
+        if post_id in _recent_ids:
+            return
+        _recent_ids.append(post_id)
+    _publish(post_id, author_id, group_slug)
+
+
+class PostWatcher(threading.Thread):
+    """Опрашивает базу и раздаёт записи, созданные другими процессами.
+
+    Один поток на процесс и только пока есть подписчики, поэтому нагрузка
+    на базу не зависит от числа открытых соединений.
+    """
+
+    daemon = True
+    batch_size = 500
+
+    def __init__(self):
+        super().__init__(name="post-watcher")
+        self.since = timezone.now()
+
+    def poll(self):
+        # listed_at выставляется до коммита, и запись становится видна
+        # позже, поэтому окно опроса захватывает немного прошлого. Порции
+        # идут по (listed_at, id): отложенные записи одной порции
+        # публикуются с одинаковым временем.
+        started = timezone.now()
+        rows = Post.objects.filter(
+            listed_at__gt=self.since - settings.LIVE_FEED_POLL_LAG
+        ).order_by("listed_at", "id").values_list(
+            "id", "author_id", "group__slug", "listed_at"
+        )
+        batch = list(rows[:self.batch_size])
+        while batch:
+            for post_id, author_id, group_slug, _ in batch:
+                _publish_polled(post_id, author_id, group_slug)
+            if len(batch) < self.batch_size:
+                break
+            last_id, *_, last_at = batch[-1]
+            batch = list(rows.filter(
+                Q(listed_at__gt=last_at) | Q(listed_at=last_at, id__gt=last_id)
+            )[:self.batch_size])
+        self.since = started
+
+    def run(self):
+        global _watcher
+        while True:
+            with _watcher_lock:
+                if not len(broker):
+                    _watcher = None
+                    return
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Не удалось опросить новые записи")
+            finally:
+                close_old_connections()
+            time.sleep(settings.LIVE_FEED_POLL_INTERVAL)
+
+
+_watcher_lock = threading.Lock()
+_watcher = None
+
+
+def ensure_watcher():
+    global _watcher
+    if not settings.LIVE_FEED_POLL_INTERVAL:
+        return
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = PostWatcher()
+            _watcher.start()
+
+
+def _index_filter(request):
+    return lambda message: True
+
+
+def _group_filter(request):
+    group = get_object_or_404(Group, slug=request.GET.get("slug", ""))
+    return lambda message: message["group"] == group.slug
+
+
+def _follow_filter(request):
+    if not request.user.is_authenticated:
+        raise PermissionDenied
+    authors = set(
+        Follow.objects.filter(user=request.user).values_list(
+            "author_id", flat=True
+        )
+    )
+    return lambda message: message["author"] in authors
+
+
+FEEDS = {
+    "index": _index_filter,
+    "group": _group_filter,
+    "follow": _follow_filter,
+}
+
+
+def feed_filter(request):
+    """Возвращает условие отбора уведомлений для ленты из ?feed=."""
+    feed = FEEDS.get(request.GET.get("feed", "index"))
+    if feed is None:
+        raise Http404
+    return feed(request)
+
+
+def sse_message(message):
+    return f"event: post\nid: {message['id']}\ndata: {json.dumps(message)}\n\n"
+
+
+def _authenticated_filter(request):
+    engine = import_module(settings.SESSION_ENGINE)
+    request.session = engine.SessionStore(
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    )
+    request.user = auth.get_user(request)
+    return feed_filter(request)
+
+
+async def _send_status(send, status):
+    await send({"type": "http.response.start", "status": status})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def sse_application(scope, receive, send):
+    """Поток событий для ASGI: соединение не занимает поток и живёт,
+    пока клиент не отключится."""
+    request = ASGIRequest(scope, io.BytesIO())
+    try:
+        accepts = await run_db(_authenticated_filter, request)
+    except Http404:
+        return await _send_status(send, 404)
+    except PermissionDenied:
+        return await _send_status(send, 403)
+
+    subscription = broker.subscribe(AsyncSubscription(accepts))
+    ensure_watcher()
+    disconnect = asyncio.ensure_future(_wait_disconnect(receive))
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": SSE_HEADERS,
+        })
+        body = RETRY
+        while not disconnect.done():
+            await send({
+                "type": "http.response.body",
+                "body": body.encode(),
+                "more_body": True,
+            })
+            message = asyncio.ensure_future(
+                subscription.get(settings.LIVE_FEED_HEARTBEAT)
+            )
+            await asyncio.wait(
+                (message, disconnect), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not message.done():
+                message.cancel()
+                break
+            result = message.result()
+            body = sse_message(result) if result else HEARTBEAT
+    finally:
+        broker.unsubscribe(subscription)
+        disconnect.cancel()
@@ -0,0 +1,188 @@
+import os
+import re
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from sorl.thumbnail import default
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile, deserialize_image_file
+from sorl.thumbnail.kvstores.base import add_prefix, del_prefix
+from sorl.thumbnail.models import KVStore
+
+from posts.models import Post
+
+DB_KVSTORES = (
+    "sorl.thumbnail.kvstores.cached_db_kvstore.KVStore",
+)
+RESOLUTION_SUFFIX = re.compile(r"@[\d.]+x(?=\.\w+$)")
+
+
+def walk_files(root, older_than=None):
+    """Лениво обходит каталог, не собирая список файлов в памяти.
+
+    С older_than пропускает файлы, изменённые позже этого момента.
+    """
+    if not os.path.isdir(root):
+        return
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and (
+                    older_than is None
+                    or entry.stat(follow_symlinks=False).st_mtime
+                    <= older_than
+                ):
+                    yield entry.path
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def media_name(path):
+    return os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, "/")
+
+
+def live_images(names):
+    # Удалённые записи ещё можно восстановить, их картинки тоже живые.
+    return set(
+        Post.all_objects.filter(image__in=names).values_list(
+            "image", flat=True
+        )
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет картинки постов, на которые не ссылается ни один пост, "
+        "и их миниатюры sorl-thumbnail."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Только показать, что будет удалено.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Сколько имён сверять с базой за один запрос.",
+        )
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help=(
+                "Не трогать файлы моложе стольких секунд: картинка "
+                "записывается на диск раньше, чем пост в базу."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if thumbnail_settings.THUMBNAIL_KVSTORE not in DB_KVSTORES:
+            raise CommandError(
+                "Поддерживается только хранилище sorl-thumbnail в базе данных."
+            )
+        self.dry_run = options["dry_run"]
+        self.batch_size = options["batch_size"]
+        self.older_than = time.time() - options["min_age"]
+        sources = self.cleanup_sources()
+        references = self.cleanup_kvstore()
+        thumbnails = self.cleanup_thumbnails()
+        verb = "Будет удалено" if self.dry_run else "Удалено"
+        self.stdout.write(
+            f"{verb}: картинок {sources}, записей кэша {references}, "
+            f"миниатюр {thumbnails}."
+        )
+
+    def cleanup_sources(self):
+        """Картинки в MEDIA_ROOT/posts/ без поста вместе с миниатюрами."""
+        upload_to = Post._meta.get_field("image").upload_to
+        root = os.path.join(settings.MEDIA_ROOT, upload_to)
+        removed = 0
+        files = walk_files(root, self.older_than)
+        for paths in batched(files, self.batch_size):
+            names = [media_name(path) for path in paths]
+            orphans = set(names) - live_images(names)
+            for name in orphans:
+                self.stdout.write(f"картинка {name}", self.style.NOTICE)
+                if not self.dry_run:
+                    default.backend.delete(name)
+            removed += len(orphans)
+        return removed
+
+    def cleanup_kvstore(self):
+        """Записи о картинках в хранилище sorl, чей пост уже удалён.
+
+        Ключи читаются постранично по возрастанию, поэтому удаление уже
+        просмотренных записей не сбивает обход.
+        """
+        prefix = add_prefix("", identity="thumbnails")
+        last_key = ""
+        removed = 0
+        while True:
+            keys = list(
+                KVStore.objects.filter(
+                    key__startswith=prefix, key__gt=last_key
+                ).order_by("key").values_list("key", flat=True)[
+                    :self.batch_size
+                ]
+            )
+            if not keys:
+                return removed
+            last_key = keys[-1]
+            image_keys = [add_prefix(del_prefix(key)) for key in keys]
+            sources = [
+                deserialize_image_file(value)
+                for value in KVStore.objects.filter(
+                    key__in=image_keys
+                ).values_list("value", flat=True)
+            ]
+            live = live_images([source.name for source in sources])
+            for source in sources:
+                if source.name in live:
+                    continue
+                self.stdout.write(f"кэш {source.name}", self.style.NOTICE)
+                removed += 1
+                if not self.dry_run:
+                    default.kvstore.delete(source)
+
+    def cleanup_thumbnails(self):
+        """Файлы миниатюр, о которых не знает хранилище sorl."""
+        root = os.path.join(
+            settings.MEDIA_ROOT, thumbnail_settings.THUMBNAIL_PREFIX
+        )
+        removed = 0
+        files = walk_files(root, self.older_than)
+        for paths in batched(files, self.batch_size):
+            keys = {}
+            for path in paths:
+                name = RESOLUTION_SUFFIX.sub("", media_name(path))
+                keys[path] = add_prefix(ImageFile(name, default.storage).key)
+            known = set(
+                KVStore.objects.filter(
+                    key__in=keys.values()
+                ).values_list("key", flat=True)
+            )
+            for path, key in keys.items():
+                if key in known:
+                    continue
+                self.stdout.write(
+                    f"миниатюра {media_name(path)}", self.style.NOTICE
+                )
+                removed += 1
+                if not self.dry_run:
+                    os.remove(path)
+        return removed
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts import tags
+
+
+class Command(BaseCommand):
+    help = (
+        "Извлекает теги и упоминания из текста всех записей. Уведомления "
+        "об упоминаниях при этом не отправляются."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        done = tags.backfill(options["batch_size"])
+        self.stdout.write(f"Обработано записей: {done}.")
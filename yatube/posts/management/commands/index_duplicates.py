@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts import duplicates
+
+
+class Command(BaseCommand):
+    help = (
+        "Считает MinHash-подписи и корзины LSH для записей без них и "
+        "отмечает повторы. С --all пересчитывает все записи."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument("--all", action="store_true")
+
+    def handle(self, *args, **options):
+        done = duplicates.backfill(options["batch_size"], options["all"])
+        self.stdout.write(f"Обработано записей: {done}.")
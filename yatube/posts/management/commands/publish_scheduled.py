@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from posts import scheduling
+
+
+class Command(BaseCommand):
+    help = (
+        "Публикует отложенные записи, время которых наступило. С --loop "
+        "работает постоянно и спит до ближайшей записи."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Не завершаться, а ждать следующих записей.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help="Наибольшая пауза между проверками в режиме --loop, сек.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            published = scheduling.publish_due(options["batch_size"])
+            if published:
+                self.stdout.write(f"Опубликовано записей: {published}.")
+            if not options["loop"]:
+                return
+            time.sleep(self.pause(options["interval"]))
+
+    def pause(self, interval):
+        # Новые отложенные записи могут появиться в любой момент, поэтому
+        # спим не дольше interval, но и не дольше, чем до ближайшей.
+        upcoming = scheduling.next_due()
+        if upcoming is None:
+            return interval
+        seconds = (upcoming - timezone.now()).total_seconds()
+        return min(interval, max(seconds, 0))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts import deletion
+
+
+class Command(BaseCommand):
+    help = (
+        "Стирает записи, удалённые раньше POST_RESTORE_WINDOW, вместе с "
+        "комментариями и картинками. Работает небольшими порциями."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, **options):
+        purged = deletion.purge(options["batch_size"])
+        self.stdout.write(f"Стёрто записей: {purged}.")
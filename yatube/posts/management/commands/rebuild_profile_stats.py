@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает дневную сводку авторов по истории записей и "
+        "комментариев. Нужна один раз после выкладки или для сверки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = stats.rebuild(options["batch_size"])
+        self.stdout.write(f"Строк сводки: {rows}.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts import suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает рекомендации авторов для всех пользователей по "
+        "графу подписок."
+    )
+
+    def handle(self, *args, **options):
+        users = suggestions.rebuild()
+        self.stdout.write(f"Рекомендации пересчитаны для {users} польз.")
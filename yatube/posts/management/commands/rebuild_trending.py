@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает рейтинги популярных записей и групп по событиям "
+        "за последние TRENDING_WINDOW. Запускается периодически и "
+        "исправляет накопившиеся расхождения инкрементальных обновлений."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        posts, groups = trending.rebuild(options["batch_size"])
+        self.stdout.write(f"Записей в рейтинге: {posts}, групп: {groups}.")
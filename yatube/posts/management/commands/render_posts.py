@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts import rendering
+
+
+class Command(BaseCommand):
+    help = (
+        "Заново строит HTML текста и превью всех записей. Миграция 0019 "
+        "заполняет их без ссылок, тегов и упоминаний; команду стоит "
+        "выполнить после неё и после смены правил разметки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        done = rendering.backfill(options["batch_size"])
+        self.stdout.write(f"Обработано записей: {done}.")
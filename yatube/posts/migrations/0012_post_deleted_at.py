@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_follow_suggestions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='Запись скрыта и будет стёрта после окна восстановления', null=True, verbose_name='Дата удаления'),
+        ),
+    ]
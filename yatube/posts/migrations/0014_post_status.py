@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+
+def mark_deleted(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    Post.objects.filter(deleted_at__isnull=False).update(status="deleted")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_revisions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Оставьте пустым, чтобы опубликовать сразу', null=True, verbose_name='Опубликовать'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Черновик'), ('scheduled', 'Отложена'), ('published', 'Опубликована'), ('deleted', 'Удалена')], default='published', max_length=10, verbose_name='Статус'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-pub_date'], name='posts_post_status_041ee2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'publish_at'], name='posts_post_status_603554_idx'),
+        ),
+        migrations.RunPython(mark_deleted, migrations.RunPython.noop),
+    ]
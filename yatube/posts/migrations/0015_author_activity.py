@@ -0,0 +1,34 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0014_post_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('posts', models.IntegerField(default=0, verbose_name='Записей')),
+                ('comments', models.IntegerField(default=0, verbose_name='Получено комментариев')),
+                ('followers', models.IntegerField(default=0, verbose_name='Прирост подписчиков')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+            ],
+            options={
+                'ordering': ('day',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='authoractivity',
+            constraint=models.UniqueConstraint(fields=('author', 'day'), name='unique_author_activity_day'),
+        ),
+    ]
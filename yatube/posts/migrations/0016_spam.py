@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_author_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='is_spam',
+            field=models.BooleanField(default=False, verbose_name='Спам'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Черновик'), ('scheduled', 'Отложена'), ('published', 'Опубликована'), ('deleted', 'Удалена'), ('spam', 'Спам')], default='published', max_length=10, verbose_name='Статус'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_spam'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSignature',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='posts.post', verbose_name='Пост')),
+                ('data', models.BinaryField(verbose_name='Подпись')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, editable=False, help_text='Более ранняя запись автора с почти тем же текстом', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='posts.post', verbose_name='Повтор записи'),
+        ),
+        migrations.CreateModel(
+            name='PostBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField(verbose_name='Полоса')),
+                ('bucket', models.BigIntegerField(db_index=True, verbose_name='Корзина')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='posts.post', verbose_name='Пост')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='postbucket',
+            constraint=models.UniqueConstraint(fields=('post', 'band'), name='unique_post_bucket'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.25 on 2026-10-19 10:44
+
+from django.db import migrations, models
+from django.utils.html import linebreaks
+from django.utils.text import Truncator
+
+# Копия правил на момент миграции: только экранирование и абзацы, без
+# ссылок, тегов и упоминаний. Их дорисовывает команда render_posts.
+PREVIEW_LENGTH = 300
+
+
+def render_existing(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    posts = Post.objects.order_by("pk").only("pk", "text")
+    last = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last)[:500])
+        if not batch:
+            return
+        for post in batch:
+            post.text_html = linebreaks(post.text, autoescape=True)
+            post.preview = linebreaks(
+                Truncator(post.text).chars(PREVIEW_LENGTH), autoescape=True
+            )
+        Post.objects.bulk_update(batch, ("text_html", "preview"))
+        last = batch[-1].pk
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_tags_mentions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='preview',
+            field=models.TextField(blank=True, editable=False, help_text='Выводится в лентах вместо полного текста', verbose_name='Начало текста в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(render_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-19 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0019_post_rendered_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='listed_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, help_text='Момент публикации, по нему живая лента находит записи', null=True, verbose_name='Появилась в лентах'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -14,8 +15,47 @@ class Group(models.Model):
         return self.title
 
 
+class PostManager(models.Manager):
+    """Только опубликованные записи: им пользуются все ленты."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(status=Post.PUBLISHED)
+
+    def without_duplicates(self, group=None):
+        """Без повторов, оригинал которых виден в той же ленте: в общей
+        или, если указана группа, в ленте группы."""
+        originals = {"duplicate_of__status": Post.PUBLISHED}
+        if group is not None:
+            originals["duplicate_of__group"] = group
+        return self.get_queryset().exclude(**originals)
+
+
 class Post(models.Model):
+    DRAFT = "draft"
+    SCHEDULED = "scheduled"
+    PUBLISHED = "published"
+    DELETED = "deleted"
+    SPAM = "spam"
+    STATUSES = (
+        (DRAFT, "Черновик"),
+        (SCHEDULED, "Отложена"),
+        (PUBLISHED, "Опубликована"),
+        (DELETED, "Удалена"),
+        (SPAM, "Спам"),
+    )
+
     text = models.TextField(verbose_name="Текст", blank=False)
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Текст в HTML",
+    )
+    preview = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Начало текста в HTML",
+        help_text="Выводится в лентах вместо полного текста",
+    )
     pub_date = models.DateTimeField(
         auto_now_add=True,
         db_index=True,
@@ -47,17 +87,101 @@ class Post(models.Model):
         blank=True,
     )
 
+    status = models.CharField(
+        max_length=10,
+        choices=STATUSES,
+        default=PUBLISHED,
+        verbose_name="Статус",
+    )
+    publish_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Опубликовать",
+        help_text="Оставьте пустым, чтобы опубликовать сразу",
+    )
+
+    listed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="Появилась в лентах",
+        help_text="Момент публикации, по нему живая лента находит записи",
+    )
+
+    deleted_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name="Дата удаления",
+        help_text="Запись скрыта и будет стёрта после окна восстановления",
+    )
+
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="duplicates",
+        verbose_name="Повтор записи",
+        help_text="Более ранняя запись автора с почти тем же текстом",
+    )
+
+    objects = PostManager()
+    all_objects = models.Manager()
+
     class Meta:
         ordering = ("-pub_date",)
+        indexes = (
+            models.Index(fields=("status", "-pub_date")),
+            models.Index(fields=("status", "publish_at")),
+        )
 
     def __str__(self):
         count_symbol = 15
         return self.text[:count_symbol]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Нужен сигналам, чтобы отличить публикацию черновика от правки.
+        instance.loaded_status = instance.__dict__.get("status")
+        return instance
+
+    @property
+    def is_published(self):
+        return self.status == self.PUBLISHED
+
+    def schedule(self, publish_at=None, draft=False):
+        """Выставляет статус по желанию автора.
+
+        Уже опубликованная запись остаётся опубликованной, черновик или
+        отложенная запись без будущей даты публикуются сейчас же.
+        """
+        if self.pk and self.is_published:
+            return
+        now = timezone.now()
+        self.publish_at = publish_at
+        if draft:
+            self.status = self.DRAFT
+        elif publish_at and publish_at > now:
+            self.status = self.SCHEDULED
+        else:
+            self.status = self.PUBLISHED
+            self.publish_at = self.pub_date = now
+
     def get_absolute_url(self):
         return reverse("posts:post_detail", kwargs={"post_id": self.pk})
 
 
+class CommentManager(models.Manager):
+    """Комментарии без отмеченных как спам."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_spam=False)
+
+
 class Comment(models.Model):
     post = models.ForeignKey(
         Post,
@@ -80,6 +204,10 @@ class Comment(models.Model):
         verbose_name="Дата размещения",
         help_text="Дата размещения комментария",
     )
+    is_spam = models.BooleanField(default=False, verbose_name="Спам")
+
+    objects = CommentManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         count_symbol = 15
@@ -103,4 +231,232 @@ class Follow(models.Model):
     )
 
     def __str__(self):
-        return self.user
+        return f"{self.user_id} -> {self.author_id}"
+
+
+class PostScore(models.Model):
+    """Популярность записи: логарифм суммы событий с затуханием по времени.
+
+    Хранится в виде, не зависящем от текущего момента, поэтому новые
+    события просто прибавляются, а пересчитывать старые строки не нужно.
+    """
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="score",
+        verbose_name="Пост",
+    )
+    score = models.FloatField(db_index=True, verbose_name="Рейтинг")
+
+    class Meta:
+        ordering = ("-score",)
+
+
+class GroupScore(models.Model):
+    """Активность группы, устроена так же, как PostScore."""
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="score",
+        verbose_name="Группа",
+    )
+    score = models.FloatField(db_index=True, verbose_name="Рейтинг")
+
+    class Meta:
+        ordering = ("-score",)
+
+
+class FollowSuggestion(models.Model):
+    """Рекомендация автора пользователю, рассчитанная заранее."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="follow_suggestions",
+        verbose_name="Пользователь",
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Рекомендуемый автор",
+    )
+    score = models.FloatField(verbose_name="Вес")
+
+    class Meta:
+        ordering = ("-score",)
+        indexes = (models.Index(fields=("user", "-score")),)
+        constraints = (
+            models.UniqueConstraint(
+                fields=("user", "author"), name="unique_follow_suggestion"
+            ),
+        )
+
+
+class PostRevision(models.Model):
+    """Версия записи: полный текст или разница с предыдущей версией."""
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="revisions",
+        verbose_name="Пост",
+    )
+    number = models.PositiveIntegerField(verbose_name="Номер версии")
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата правки",
+    )
+    is_snapshot = models.BooleanField(
+        default=False,
+        verbose_name="Полный текст",
+    )
+    data = models.TextField(verbose_name="Текст или разница")
+    image = models.CharField(
+        max_length=100, blank=True, verbose_name="Картинка"
+    )
+
+    class Meta:
+        ordering = ("number",)
+        constraints = (
+            models.UniqueConstraint(
+                fields=("post", "number"), name="unique_post_revision"
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.post_id}#{self.number}"
+
+
+class AuthorActivity(models.Model):
+    """Дневная сводка по автору для панели статистики в профиле.
+
+    Обновляется при публикации записей, комментариях и подписках, так
+    что панель читает не больше строк, чем дней в показанном периоде.
+    """
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="activity",
+        verbose_name="Автор",
+    )
+    day = models.DateField(verbose_name="День")
+    posts = models.IntegerField(default=0, verbose_name="Записей")
+    comments = models.IntegerField(
+        default=0, verbose_name="Получено комментариев"
+    )
+    followers = models.IntegerField(
+        default=0, verbose_name="Прирост подписчиков"
+    )
+
+    class Meta:
+        ordering = ("day",)
+        constraints = (
+            models.UniqueConstraint(
+                fields=("author", "day"), name="unique_author_activity_day"
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.author_id}@{self.day}"
+
+
+class PostSignature(models.Model):
+    """MinHash-подпись текста записи, см. posts.similarity."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="signature",
+        verbose_name="Пост",
+    )
+    data = models.BinaryField(verbose_name="Подпись")
+
+
+class PostBucket(models.Model):
+    """Корзина полосы MinHash-подписи: LSH-индекс похожих записей.
+
+    Похожие тексты с высокой вероятностью делят корзину хотя бы одной
+    полосы, так что кандидаты находятся по индексу, без перебора записей.
+    """
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="buckets",
+        verbose_name="Пост",
+    )
+    band = models.PositiveSmallIntegerField(verbose_name="Полоса")
+    bucket = models.BigIntegerField(db_index=True, verbose_name="Корзина")
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("post", "band"), name="unique_post_bucket"
+            ),
+        )
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50, unique=True, verbose_name="Тег")
+
+    class Meta:
+        ordering = ("name",)
+
+    def __str__(self):
+        return f"#{self.name}"
+
+    def get_absolute_url(self):
+        return reverse("posts:tag_list", kwargs={"name": self.name})
+
+
+class PostTag(models.Model):
+    """Тег в тексте записи.
+
+    Дата публикации скопирована из записи, чтобы лента тега читалась
+    диапазоном индекса (tag, -pub_date), а не сортировкой всех записей.
+    """
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name="post_links",
+        verbose_name="Тег",
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="tag_links",
+        verbose_name="Пост",
+    )
+    pub_date = models.DateTimeField(verbose_name="Дата публикации")
+
+    class Meta:
+        indexes = (models.Index(fields=("tag", "-pub_date")),)
+        constraints = (
+            models.UniqueConstraint(
+                fields=("post", "tag"), name="unique_post_tag"
+            ),
+        )
+
+
+class Mention(models.Model):
+    """Упоминание пользователя в тексте записи."""
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="mentions",
+        verbose_name="Пост",
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="mentions",
+        verbose_name="Пользователь",
+    )
+    notified = models.BooleanField(default=False, verbose_name="Уведомлён")
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=("post", "user"), name="unique_mention"
+            ),
+        )
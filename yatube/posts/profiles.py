@@ -0,0 +1,87 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import Http404
+
+from .models import Follow, Post, User
+
+# Поля пользователя в сводке, в порядке их объявления в модели:
+# этого требует Model.from_db.
+FIELDS = ("id", "username", "first_name", "last_name")
+
+
+def _cache():
+    return caches[settings.USER_SUMMARY_CACHE]
+
+
+def _id_key(user_id):
+    return f"user-summary:id:{user_id}"
+
+
+def _name_key(username):
+    # Имя приходит из URL как есть: пробелы и длина не должны ломать
+    # ключ memcached.
+    digest = hashlib.md5(username.encode()).hexdigest()
+    return f"user-summary:name:{digest}"
+
+
+def _load(**lookup):
+    data = User.objects.filter(**lookup).values(*FIELDS).first()
+    if data is None:
+        return None
+    user_id = data["id"]
+    data["posts_count"] = Post.objects.filter(author_id=user_id).count()
+    data["followers_count"] = Follow.objects.filter(author_id=user_id).count()
+    data["following_count"] = Follow.objects.filter(user_id=user_id).count()
+    _cache().set_many(
+        {_id_key(user_id): data, _name_key(data["username"]): user_id},
+        settings.USER_SUMMARY_TIMEOUT,
+    )
+    return data
+
+
+def summary(username=None, user_id=None):
+    """Сводка о пользователе из кэша: имя, полное имя и счётчики.
+
+    По имени в кэше лежит только id, так что сброс сводки по id
+    действует и на поиск по имени. Возвращает None для неизвестного
+    пользователя.
+    """
+    if user_id is None:
+        user_id = _cache().get(_name_key(username))
+        if user_id is None:
+            return _load(username=username)
+    data = _cache().get(_id_key(user_id))
+    if data is None:
+        if username is None:
+            return _load(id=user_id)
+        return _load(username=username)
+    if username is not None and data["username"] != username:
+        # Пользователь переименован, или его id достался другому.
+        return _load(username=username)
+    return data
+
+
+def get_user(username=None, user_id=None):
+    """Пользователь из сводки, без запроса к таблице пользователей.
+
+    Остальные поля модели отложены и подгрузятся при обращении. Счётчики
+    доступны как posts_count, followers_count и following_count.
+    """
+    data = summary(username, user_id)
+    if data is None:
+        raise Http404
+    user = User.from_db("default", FIELDS, [data[name] for name in FIELDS])
+    user.posts_count = data["posts_count"]
+    user.followers_count = data["followers_count"]
+    user.following_count = data["following_count"]
+    return user
+
+
+def invalidate(*user_ids):
+    _cache().delete_many([_id_key(user_id) for user_id in user_ids])
+
+
+def clear():
+    _cache().clear()
@@ -0,0 +1,91 @@
+import re
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils.html import escape, format_html, linebreaks, urlize
+from django.utils.text import Truncator
+
+from .models import Post, User
+from .tags import HASHTAG, MENTION
+
+# Слова со ссылкой или адресом почты целиком отдаются urlize, иначе теги
+# нашлись бы и внутри адреса ссылки.
+LINK = re.compile(r"://|^\W*www\.|\w@\w", re.IGNORECASE)
+SPACE = re.compile(r"(\s+)")
+TOKEN = re.compile(f"{HASHTAG.pattern}|{MENTION.pattern}")
+
+
+def _word(word, usernames):
+    if LINK.search(word):
+        return urlize(word, nofollow=True, autoescape=True)
+    parts = []
+    position = 0
+    for match in TOKEN.finditer(word):
+        tag, username = match.groups()
+        if tag:
+            link = format_html(
+                '<a href="{}">#{}</a>',
+                reverse("posts:tag_list", args=(tag.lower(),)),
+                tag,
+            )
+        elif username in usernames:
+            link = format_html(
+                '<a href="{}">@{}</a>',
+                reverse("posts:profile", args=(username,)),
+                username,
+            )
+        else:
+            continue
+        parts.append(escape(word[position:match.start()]))
+        parts.append(link)
+        position = match.end()
+    parts.append(escape(word[position:]))
+    return "".join(parts)
+
+
+def render(text, usernames=()):
+    """Безопасный HTML текста: абзацы, переносы строк, ссылки, теги и
+    упоминания пользователей из usernames."""
+    html = "".join(
+        part if part.isspace() else _word(part, usernames)
+        for part in SPACE.split(text)
+    )
+    return linebreaks(html)
+
+
+def existing_usernames(text, users=User.objects):
+    names = MENTION.findall(text)
+    if not names:
+        return set()
+    return set(
+        users.filter(username__in=names).values_list("username", flat=True)
+    )
+
+
+def render_post(post, users=User.objects):
+    """Заполняет text_html и preview записи по её тексту.
+
+    Ленты выводят готовый preview и не читают полный текст.
+    """
+    usernames = existing_usernames(post.text, users)
+    post.text_html = render(post.text, usernames)
+    post.preview = render(
+        Truncator(post.text).chars(settings.POST_PREVIEW_LENGTH), usernames
+    )
+
+
+def backfill(batch_size=500):
+    """Заполняет text_html и preview всех записей порциями.
+    Возвращает число записей."""
+    posts = Post.all_objects.order_by("pk").only("pk", "text")
+    done = 0
+    last = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last)[:batch_size])
+        if not batch:
+            return done
+        for post in batch:
+            render_post(post)
+        Post.all_objects.bulk_update(batch, ("text_html", "preview"))
+        done += len(batch)
+        last = batch[-1].pk
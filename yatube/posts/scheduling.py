@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Post
+from .signals import post_published
+
+
+def _due():
+    # Запрос целиком покрывается индексом (status, publish_at).
+    return Post.all_objects.filter(
+        status=Post.SCHEDULED, publish_at__lte=timezone.now()
+    ).order_by("publish_at")
+
+
+def publish_due(batch_size=500):
+    """Публикует отложенные записи, время которых наступило.
+
+    Каждая порция переводится одним UPDATE, дата публикации становится
+    запланированной, а listed_at — текущим временем. Возвращает число
+    опубликованных записей.
+    """
+    published = 0
+    while True:
+        ids = list(_due().values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return published
+        with transaction.atomic():
+            published += Post.all_objects.filter(
+                id__in=ids, status=Post.SCHEDULED
+            ).update(
+                status=Post.PUBLISHED,
+                pub_date=F("publish_at"),
+                listed_at=timezone.now(),
+            )
+            for post in Post.objects.filter(id__in=ids).select_related(
+                "group"
+            ):
+                post_published.send(sender=Post, instance=post)
+
+
+def next_due():
+    """Время ближайшей отложенной записи или None."""
+    return Post.all_objects.filter(status=Post.SCHEDULED).order_by(
+        "publish_at"
+    ).values_list("publish_at", flat=True).first()
@@ -0,0 +1,114 @@
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_migrate, post_save,
+                                      pre_save)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from . import duplicates, live, profiles, rendering, stats, tags, trending
+from .models import Comment, Follow, Post, User
+
+# Запись стала видна в лентах: создана сразу опубликованной, черновик
+# опубликован автором или наступило время отложенной записи.
+post_published = Signal()
+
+
+def _publishing(instance, created):
+    if not instance.is_published:
+        return False
+    loaded_status = getattr(instance, "loaded_status", None)
+    return created or loaded_status in (Post.DRAFT, Post.SCHEDULED, Post.SPAM)
+
+
+@receiver(pre_save, sender=Post)
+def stamp_publication(sender, instance, raw=False, **kwargs):
+    if not raw and _publishing(instance, instance._state.adding):
+        instance.listed_at = timezone.now()
+
+
+@receiver(post_save, sender=Post)
+def detect_publication(sender, instance, created, raw=False, **kwargs):
+    if raw or not instance.is_published:
+        return
+    if _publishing(instance, created):
+        post_published.send(sender=Post, instance=instance)
+    instance.loaded_status = instance.status
+
+
+@receiver(pre_save, sender=Post)
+def render_text(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "text" not in update_fields):
+        return
+    rendering.render_post(instance)
+
+
+@receiver(post_save, sender=Post)
+def index_text(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "text" not in update_fields):
+        return
+    duplicates.index(instance)
+    tags.extract(instance)
+
+
+@receiver(post_published)
+def date_tags(sender, instance, **kwargs):
+    tags.published(instance)
+
+
+@receiver(post_published)
+def publish_new_post(sender, instance, **kwargs):
+    transaction.on_commit(lambda: live.publish_post(instance))
+
+
+@receiver(post_published)
+def score_new_post(sender, instance, **kwargs):
+    trending.record_post(instance)
+
+
+@receiver(post_published)
+def count_new_post(sender, instance, **kwargs):
+    stats.record_post(instance)
+
+
+@receiver(post_save, sender=Comment)
+def score_new_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not instance.is_spam:
+        trending.record_comment(instance)
+        stats.record_comment(instance)
+
+
+@receiver(post_save, sender=Follow)
+def count_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.record_follow(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def count_unfollow(sender, instance, **kwargs):
+    stats.record_follow(instance, -1)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user(sender, instance, **kwargs):
+    profiles.invalidate(instance.pk)
+
+
+@receiver(post_published)
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def forget_author(sender, instance, **kwargs):
+    profiles.invalidate(instance.author_id)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def forget_follow(sender, instance, **kwargs):
+    profiles.invalidate(instance.user_id, instance.author_id)
+
+
+@receiver(post_migrate)
+def forget_all_users(sender, **kwargs):
+    # migrate и flush меняют таблицы в обход сигналов моделей. Сигнал
+    # приходит от каждого приложения, кэш достаточно очистить один раз.
+    if sender.name == "posts":
+        profiles.clear()
@@ -0,0 +1,110 @@
+import hashlib
+import random
+import re
+import struct
+from functools import lru_cache
+
+from django.conf import settings
+
+# Простое число Мерсенна 2^61 - 1: модуль для семейства хеш-функций
+# a * x + b, которыми MinHash заменяет случайные перестановки.
+PRIME = (1 << 61) - 1
+HASH_MASK = (1 << 63) - 1
+WORD = re.compile(r"\w+")
+
+
+def stable_hash(value):
+    """63-битный хеш строки, одинаковый во всех процессах.
+
+    Встроенный hash() для строк меняется от запуска к запуску, а
+    подписи и номера корзин хранятся и сравниваются между процессами.
+    """
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & HASH_MASK
+
+
+def shingles(text, size=None):
+    """Хеши n-грамм из слов текста без учёта регистра и пунктуации."""
+    size = size or settings.SIMILARITY_NGRAM
+    words = WORD.findall(text.lower())
+    if len(words) <= size:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {
+            " ".join(words[start:start + size])
+            for start in range(len(words) - size + 1)
+        }
+    return {stable_hash(gram) for gram in grams}
+
+
+@lru_cache(maxsize=None)
+def _coefficients(count):
+    # Фиксированное зерно: подписи, посчитанные в разных процессах и в
+    # разное время, должны быть сравнимы.
+    rng = random.Random(count)
+    return tuple(
+        (rng.randrange(1, PRIME), rng.randrange(PRIME))
+        for _ in range(count)
+    )
+
+
+def _row(value, coefficients):
+    return tuple((a * value + b) % PRIME for a, b in coefficients)
+
+
+def signatures(texts):
+    """MinHash-подписи текстов из SIMILARITY_PERMUTATIONS чисел.
+
+    Доля совпадающих позиций двух подписей оценивает коэффициент
+    Жаккара их множеств n-грамм. Значения хеш-функций для n-граммы
+    считаются один раз на всю пачку текстов, а минимумы по столбцам
+    берутся через zip и map без цикла на Python. Для текста без слов
+    подпись — None.
+    """
+    coefficients = _coefficients(settings.SIMILARITY_PERMUTATIONS)
+    rows = {}
+    result = []
+    for text in texts:
+        hashes = shingles(text)
+        if not hashes:
+            result.append(None)
+            continue
+        for value in hashes - rows.keys():
+            rows[value] = _row(value, coefficients)
+        result.append(list(map(min, zip(*(rows[h] for h in hashes)))))
+    return result
+
+
+def signature(text):
+    return signatures((text,))[0]
+
+
+def pack(sig):
+    return struct.pack(f"<{len(sig)}Q", *sig)
+
+
+def unpack(data):
+    return list(struct.unpack(f"<{len(data) // 8}Q", data))
+
+
+def bands(sig):
+    """Пары (номер полосы, корзина) подписи для LSH.
+
+    Подпись режется на SIMILARITY_BANDS полос, каждая полоса хешируется
+    в корзину. Тексты попадают в общую корзину хотя бы одной полосы с
+    высокой вероятностью, только если они похожи.
+    """
+    count = settings.SIMILARITY_BANDS
+    rows = len(sig) // count
+    return [
+        (band, stable_hash(",".join(map(str, sig[band * rows:][:rows]))))
+        for band in range(count)
+    ]
+
+
+def similarity(first, second):
+    """Оценка сходства текстов по двум подписям, от 0 до 1."""
+    if not first or not second:
+        return 0.0
+    same = sum(a == b for a, b in zip(first, second))
+    return same / len(first)
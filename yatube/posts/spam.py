@@ -0,0 +1,220 @@
+"""Оценка записей и комментариев на спам.
+
+Проверка — функция (text, author_id, kind) -> float, её результат
+прибавляется к общему баллу; kind — "post" или "comment". Проверки из
+SPAM_CHECKS (при правке записи — SPAM_EDIT_CHECKS) выполняются в запросе
+по очереди, пока не истечёт SPAM_TIME_BUDGET, оставшиеся и
+SPAM_BACKGROUND_CHECKS досчитываются в очереди задач. Набравшее
+SPAM_THRESHOLD скрывается из лент до решения модератора.
+"""
+import re
+import time
+import uuid
+from itertools import chain
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core import jobs
+
+from . import similarity, stats, trending
+from .models import Comment, Post
+
+LINK = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+
+class Verdict:
+    """Балл проверок, успевших в запросе, и пути отложенных."""
+
+    def __init__(self, score=0, pending=()):
+        self.score = score
+        self.pending = list(pending)
+
+    @property
+    def is_spam(self):
+        return self.score >= settings.SPAM_THRESHOLD
+
+
+def _cache():
+    return caches[settings.SPAM_CACHE]
+
+
+def _kind(obj):
+    return "post" if isinstance(obj, Post) else "comment"
+
+
+def run_checks(text, author_id, kind, checks, deadline=None):
+    """Прибавляет баллы проверок checks к Verdict.
+
+    Проверка, начатая до deadline, доводится до конца, остальные
+    попадают в Verdict.pending.
+    """
+    verdict = Verdict()
+    for index, path in enumerate(checks):
+        if deadline is not None and time.monotonic() >= deadline:
+            verdict.pending.extend(checks[index:])
+            break
+        verdict.score += import_string(path)(text, author_id, kind)
+    return verdict
+
+
+def screen(obj):
+    """Оценивает ещё не сохранённую запись или комментарий, в том числе
+    правку существующей записи.
+
+    Спам сразу получает отметку и в ленты не попадает. Опубликованную
+    запись скрывает defer(), чтобы поправить сводку. Возвращает Verdict,
+    который после сохранения передаётся в defer().
+    """
+    deadline = time.monotonic() + settings.SPAM_TIME_BUDGET
+    checks = settings.SPAM_EDIT_CHECKS if obj.pk else settings.SPAM_CHECKS
+    verdict = run_checks(
+        obj.text, obj.author_id, _kind(obj), checks, deadline
+    )
+    verdict.pending.extend(settings.SPAM_BACKGROUND_CHECKS)
+    if verdict.is_spam and not (obj.pk and obj.is_published):
+        _mark(obj)
+    return verdict
+
+
+def defer(obj, verdict):
+    """Скрывает опубликованный спам и ставит в очередь проверки, не
+    уложившиеся в запрос."""
+    if verdict.is_spam:
+        if not is_flagged(obj):
+            flag(obj)
+        return
+    if verdict.pending:
+        jobs.enqueue(
+            recheck, _kind(obj), obj.pk, verdict.score, verdict.pending
+        )
+
+
+def _mark(obj):
+    if isinstance(obj, Post):
+        obj.status = Post.SPAM
+    else:
+        obj.is_spam = True
+
+
+def _load(kind, pk):
+    model = Post if kind == "post" else Comment
+    return model.all_objects.filter(pk=pk).first()
+
+
+def recheck(kind, pk, score, checks):
+    """Фоновая часть проверки: досчитывает checks к баллу из запроса."""
+    obj = _load(kind, pk)
+    if obj is None or is_flagged(obj):
+        return
+    verdict = run_checks(obj.text, obj.author_id, kind, checks)
+    verdict.score += score
+    if verdict.is_spam:
+        flag(obj)
+
+
+def is_flagged(obj):
+    if isinstance(obj, Post):
+        return obj.status == Post.SPAM
+    return obj.is_spam
+
+
+def flag(obj):
+    """Скрывает уже сохранённую запись или комментарий как спам."""
+    if isinstance(obj, Post):
+        if obj.is_published:
+            stats.record_post(obj, -1)
+        obj.status = Post.SPAM
+        obj.save(update_fields=("status",))
+        return
+    stats.record_comment(obj, -1)
+    obj.is_spam = True
+    obj.save(update_fields=("is_spam",))
+
+
+def approve(obj):
+    """Решение модератора «не спам»: возвращает объект в ленты."""
+    if not is_flagged(obj):
+        return
+    if isinstance(obj, Post):
+        obj.schedule(obj.publish_at)
+        obj.save()
+        return
+    obj.is_spam = False
+    obj.save(update_fields=("is_spam",))
+    trending.record_comment(obj)
+    stats.record_comment(obj)
+
+
+def blocked_words(text, author_id, kind):
+    words = set(similarity.WORD.findall(text.lower()))
+    if words & set(settings.SPAM_BLOCKED_WORDS):
+        return settings.SPAM_THRESHOLD
+    return 0
+
+
+def links(text, author_id, kind):
+    count = len(LINK.findall(text))
+    extra = max(0, count - settings.SPAM_LINKS_ALLOWED)
+    return extra * settings.SPAM_LINK_WEIGHT
+
+
+def velocity(text, author_id, kind):
+    """Сколько раз автор писал за текущее окно сверх лимита.
+
+    Счётчик живёт в кэше и стоит одного incr на запрос.
+    """
+    window = int(settings.SPAM_VELOCITY_WINDOW.total_seconds())
+    key = f"spam:velocity:{kind}:{author_id}:{int(time.time()) // window}"
+    store = _cache()
+    store.add(key, 0, window)
+    try:
+        count = store.incr(key)
+    except ValueError:
+        # Ключ успел истечь между add и incr.
+        store.set(key, 1, window)
+        count = 1
+    extra = max(0, count - settings.SPAM_VELOCITY_LIMITS[kind])
+    return extra * settings.SPAM_VELOCITY_WEIGHT
+
+
+def duplicates(text, author_id, kind):
+    """Сколько похожих текстов было за SPAM_DUPLICATE_WINDOW.
+
+    Недавние тексты лежат в кэше LSH-индексом: корзина полосы MinHash
+    хранит метки попавших в неё текстов. Поиск — один get_many по
+    полосам, без перебора записей. Короткие тексты вроде «Спасибо!» у
+    разных людей совпадают сами по себе и не проверяются.
+    """
+    if len(similarity.shingles(text)) < settings.SPAM_DUPLICATE_MIN_SHINGLES:
+        return 0
+    sig = similarity.signature(text)
+    keys = [
+        f"spam:lsh:{band}:{bucket:x}"
+        for band, bucket in similarity.bands(sig)
+    ]
+    store = _cache()
+    found = store.get_many(keys)
+    matches = set(chain.from_iterable(found.values()))
+    token = uuid.uuid4().hex[:12]
+    size = settings.SPAM_DUPLICATE_BUCKET_SIZE
+    store.set_many(
+        {key: (found.get(key, []) + [token])[-size:] for key in keys},
+        int(settings.SPAM_DUPLICATE_WINDOW.total_seconds()),
+    )
+    extra = max(0, len(matches) - settings.SPAM_DUPLICATES_ALLOWED)
+    return extra * settings.SPAM_DUPLICATE_WEIGHT
+
+
+def author_history(text, author_id, kind):
+    """Спам автора за SPAM_HISTORY_WINDOW. Читает базу, поэтому по
+    умолчанию выполняется в фоне."""
+    since = timezone.now() - settings.SPAM_HISTORY_WINDOW
+    flagged = Post.all_objects.filter(
+        author_id=author_id, status=Post.SPAM, pub_date__gte=since
+    ).count() + Comment.all_objects.filter(
+        author_id=author_id, is_spam=True, created__gte=since
+    ).count()
+    return flagged * settings.SPAM_HISTORY_WEIGHT
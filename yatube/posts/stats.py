@@ -0,0 +1,182 @@
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AuthorActivity, Comment, Follow, Post
+
+HEATMAP_LEVELS = 4
+COUNTERS = ("posts", "comments", "followers")
+
+
+def _add(author_id, day, **deltas):
+    rows = AuthorActivity.objects.filter(author_id=author_id, day=day)
+    updates = {name: F(name) + value for name, value in deltas.items()}
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            AuthorActivity.objects.create(
+                author_id=author_id, day=day, **deltas
+            )
+    except IntegrityError:
+        # Строку за этот день успел создать параллельный запрос.
+        rows.update(**updates)
+
+
+def _record_comments(comments, delta):
+    counts = comments.annotate(day=TruncDate("created")).values(
+        "post__author_id", "day"
+    ).annotate(count=Count("id")).order_by()
+    for item in counts:
+        _add(
+            item["post__author_id"],
+            item["day"],
+            comments=delta * item["count"],
+        )
+
+
+def record_post(post, delta=1):
+    """Учитывает публикацию записи (delta=-1 — её удаление или скрытие).
+
+    Сводка считает только комментарии к опубликованным записям, поэтому
+    они уходят и возвращаются вместе с записью.
+    """
+    _add(post.author_id, timezone.localdate(post.pub_date), posts=delta)
+    _record_comments(Comment.objects.filter(post_id=post.pk), delta)
+
+
+def record_hidden_posts(posts):
+    """Вычитает из сводки опубликованные записи posts и комментарии к ним
+    перед массовым скрытием: по запросу на группировку и по UPDATE на
+    автора и день."""
+    counts = posts.annotate(day=TruncDate("pub_date")).values(
+        "author_id", "day"
+    ).annotate(count=Count("id")).order_by()
+    for item in counts:
+        _add(item["author_id"], item["day"], posts=-item["count"])
+    _record_comments(Comment.objects.filter(post__in=posts), -1)
+
+
+def record_comment(comment, delta=1):
+    _add(
+        comment.post.author_id,
+        timezone.localdate(comment.created),
+        comments=delta,
+    )
+
+
+def record_follow(follow, delta=1):
+    _add(follow.author_id, timezone.localdate(), followers=delta)
+
+
+def _month_start(day, months_back=0):
+    month = day.year * 12 + day.month - 1 - months_back
+    return day.replace(year=month // 12, month=month % 12 + 1, day=1)
+
+
+def _months(rows, totals, today):
+    count = settings.PROFILE_STATS_MONTHS
+    months = {}
+    for back in range(count - 1, -1, -1):
+        start = _month_start(today, back)
+        months[start] = {"month": start, **dict.fromkeys(COUNTERS, 0)}
+    for day, *values in rows:
+        month = months.get(_month_start(day))
+        if month is not None:
+            for name, value in zip(COUNTERS, values):
+                month[name] += value
+    # Число подписчиков на конец месяца: от текущего итога назад.
+    followers = totals["followers"] or 0
+    for month in reversed(list(months.values())):
+        month["total_followers"] = followers
+        followers -= month["followers"]
+    return list(months.values())
+
+
+def _heatmap(rows, today):
+    weeks = settings.PROFILE_STATS_HEATMAP_WEEKS
+    start = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    activity = {day: posts for day, posts, *_ in rows if day >= start}
+    busiest = max(activity.values(), default=0)
+    grid = []
+    for week in range(weeks):
+        cells = []
+        for weekday in range(7):
+            day = start + timedelta(weeks=week, days=weekday)
+            posts = activity.get(day, 0)
+            level = 0
+            if posts > 0 and day <= today:
+                level = math.ceil(posts * HEATMAP_LEVELS / busiest)
+            cells.append({"day": day, "posts": posts, "level": level})
+        grid.append(cells)
+    return grid
+
+
+def profile_stats(author_id):
+    """Данные панели статистики автора.
+
+    Читаются только строки сводки за показанный период и одна сумма по
+    всей сводке, так что число записей автора на стоимость не влияет.
+    """
+    today = timezone.localdate()
+    since = min(
+        _month_start(today, settings.PROFILE_STATS_MONTHS - 1),
+        today - timedelta(
+            days=today.weekday(),
+            weeks=settings.PROFILE_STATS_HEATMAP_WEEKS - 1,
+        ),
+    )
+    activity = AuthorActivity.objects.filter(author_id=author_id)
+    totals = activity.aggregate(**{name: Sum(name) for name in COUNTERS})
+    rows = list(
+        activity.filter(day__gte=since).values_list("day", *COUNTERS)
+    )
+    return {
+        "totals": {name: totals[name] or 0 for name in COUNTERS},
+        "months": _months(rows, totals, today),
+        "heatmap": _heatmap(rows, today),
+    }
+
+
+def rebuild(batch_size=1000):
+    """Пересчитывает сводку по истории записей и комментариев.
+
+    У подписок нет даты, поэтому текущее число подписчиков относится к
+    сегодняшнему дню. Возвращает число строк сводки.
+    """
+    rows = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    posts = Post.objects.annotate(day=TruncDate("pub_date")).values(
+        "author_id", "day"
+    ).annotate(count=Count("id")).order_by()
+    for item in posts:
+        rows[item["author_id"], item["day"]]["posts"] = item["count"]
+    comments = Comment.objects.filter(
+        post__status=Post.PUBLISHED
+    ).annotate(day=TruncDate("created")).values(
+        "post__author_id", "day"
+    ).annotate(count=Count("id")).order_by()
+    for item in comments:
+        key = item["post__author_id"], item["day"]
+        rows[key]["comments"] = item["count"]
+    today = timezone.localdate()
+    follows = Follow.objects.values("author_id").annotate(
+        count=Count("id")
+    ).order_by()
+    for item in follows:
+        rows[item["author_id"], today]["followers"] = item["count"]
+    with transaction.atomic():
+        AuthorActivity.objects.all().delete()
+        AuthorActivity.objects.bulk_create(
+            (
+                AuthorActivity(author_id=author_id, day=day, **counters)
+                for (author_id, day), counters in rows.items()
+            ),
+            batch_size=batch_size,
+        )
+    return len(rows)
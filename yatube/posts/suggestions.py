@@ -0,0 +1,141 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Follow, FollowSuggestion
+
+
+class Adjacency:
+    """Списки смежности в трёх плоских массивах (CSR).
+
+    Пары должны приходить отсортированными по первому элементу. На ребро
+    уходит восемь байт вместо объекта-кортежа в словаре множеств.
+    """
+
+    def __init__(self, pairs):
+        self.keys = array("q")
+        self.offsets = array("q", (0,))
+        self.targets = array("q")
+        for key, target in pairs:
+            if not self.keys or self.keys[-1] != key:
+                if self.keys:
+                    self.offsets.append(len(self.targets))
+                self.keys.append(key)
+            self.targets.append(target)
+        if self.keys:
+            self.offsets.append(len(self.targets))
+
+    def __getitem__(self, key):
+        index = bisect_left(self.keys, key)
+        if index == len(self.keys) or self.keys[index] != key:
+            return ()
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+
+class FollowGraph:
+    def __init__(self, edges):
+        """edges - queryset Follow, из которого читаются только id."""
+        self.following = Adjacency(
+            edges.order_by("user_id", "author_id").values_list(
+                "user_id", "author_id"
+            ).iterator(chunk_size=settings.SUGGESTIONS_BATCH_SIZE)
+        )
+        self.followers = Adjacency(
+            edges.order_by("author_id", "user_id").values_list(
+                "author_id", "user_id"
+            ).iterator(chunk_size=settings.SUGGESTIONS_BATCH_SIZE)
+        )
+
+    @classmethod
+    def around(cls, user_id):
+        """Граф только из рёбер, нужных для рекомендаций одному
+        пользователю: его подписки, их подписки и подписки их читателей."""
+        fanout = settings.SUGGESTIONS_FANOUT
+        authors = list(
+            Follow.objects.filter(user_id=user_id).values_list(
+                "author_id", flat=True
+            )[:fanout]
+        )
+        readers = list(
+            Follow.objects.filter(author_id__in=authors).exclude(
+                user_id=user_id
+            ).values_list("user_id", flat=True).distinct()[:fanout]
+        )
+        return cls(Follow.objects.filter(
+            Q(user_id=user_id)
+            | Q(user_id__in=authors)
+            | Q(author_id__in=authors)
+            | Q(user_id__in=readers)
+        ))
+
+
+def suggest(graph, user_id):
+    """Возвращает [(автор, вес)] для пользователя.
+
+    Вес складывается из числа подписок пользователя, читающих автора
+    (друзья друзей), и близости по общим читателям: автора читают те же
+    люди, что и авторов пользователя. Вклад популярных авторов делится на
+    число их читателей, чтобы рекомендации не сводились к топу.
+    """
+    fanout = settings.SUGGESTIONS_FANOUT
+    followed = graph.following[user_id][:fanout]
+    friends = Counter()
+    for author in followed:
+        friends.update(graph.following[author][:fanout])
+    similar = defaultdict(float)
+    for author in followed:
+        readers = graph.followers[author][:fanout]
+        for reader in readers:
+            if reader == user_id:
+                continue
+            for candidate in graph.following[reader][:fanout]:
+                similar[candidate] += 1 / len(readers)
+    excluded = set(followed)
+    excluded.add(user_id)
+    scores = (
+        (candidate, settings.SUGGESTIONS_FRIENDS_WEIGHT * friends[candidate]
+         + settings.SUGGESTIONS_SIMILAR_WEIGHT * similar[candidate])
+        for candidate in set(friends) | set(similar)
+        if candidate not in excluded
+    )
+    return heapq.nlargest(
+        settings.SUGGESTIONS_LIMIT, scores, key=lambda item: item[1]
+    )
+
+
+def _store(suggestions):
+    """suggestions - {пользователь: [(автор, вес)]}."""
+    with transaction.atomic():
+        FollowSuggestion.objects.filter(user_id__in=suggestions).delete()
+        FollowSuggestion.objects.bulk_create(
+            FollowSuggestion(user_id=user_id, author_id=author_id, score=score)
+            for user_id, items in suggestions.items()
+            for author_id, score in items
+        )
+
+
+def refresh(user_id):
+    """Пересчитывает рекомендации одного пользователя после подписки
+    или отписки."""
+    _store({user_id: suggest(FollowGraph.around(user_id), user_id)})
+
+
+def rebuild():
+    """Пересчитывает рекомендации всех, у кого есть подписки."""
+    graph = FollowGraph(Follow.objects.all())
+    FollowSuggestion.objects.filter(user__follower__isnull=True).delete()
+    batch = {}
+    total = 0
+    for user_id in graph.following.keys:
+        batch[user_id] = suggest(graph, user_id)
+        if len(batch) >= settings.SUGGESTIONS_BATCH_SIZE:
+            _store(batch)
+            total += len(batch)
+            batch = {}
+    _store(batch)
+    return total + len(batch)
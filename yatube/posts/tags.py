@@ -0,0 +1,127 @@
+import re
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from core import jobs
+
+from .models import Mention, Post, PostTag, Tag, User
+
+# Решётка внутри слова или HTML-сущности (&#39;) тегом не считается,
+# собака внутри адреса почты — упоминанием.
+HASHTAG = re.compile(r"(?<![\w&#])#(\w{1,50})")
+MENTION = re.compile(r"(?<![\w@])@([\w.+-]{0,149}\w)")
+
+
+def hashtags(text):
+    return {name.lower() for name in HASHTAG.findall(text)}
+
+
+def mentions(text):
+    return set(MENTION.findall(text))
+
+
+def _tags(names):
+    Tag.objects.bulk_create(
+        (Tag(name=name) for name in names), ignore_conflicts=True
+    )
+    return Tag.objects.filter(name__in=names)
+
+
+def _sync_tags(post, names):
+    links = dict(
+        PostTag.objects.filter(post=post).values_list("tag__name", "id")
+    )
+    removed = [link for name, link in links.items() if name not in names]
+    if removed:
+        PostTag.objects.filter(id__in=removed).delete()
+    added = names - links.keys()
+    if added:
+        PostTag.objects.bulk_create(
+            PostTag(post=post, tag=tag, pub_date=post.pub_date)
+            for tag in _tags(added)
+        )
+
+
+def _sync_mentions(post, usernames, notified):
+    user_ids = set(
+        User.objects.filter(username__in=usernames).exclude(
+            pk=post.author_id
+        ).values_list("pk", flat=True)
+    ) if usernames else set()
+    current = set(
+        Mention.objects.filter(post=post).values_list("user_id", flat=True)
+    )
+    if current - user_ids:
+        Mention.objects.filter(
+            post=post, user_id__in=current - user_ids
+        ).delete()
+    added = user_ids - current
+    Mention.objects.bulk_create(
+        Mention(post=post, user_id=user_id, notified=notified)
+        for user_id in added
+    )
+    return added
+
+
+def extract(post, notify=True):
+    """Приводит теги и упоминания записи в соответствие с её текстом.
+
+    Пишутся только добавленные и удалённые ссылки, так что правка без
+    изменения тегов обходится чтениями. О новых упоминаниях в уже
+    опубликованной записи уведомляет очередь задач, в черновике — при
+    публикации.
+    """
+    _sync_tags(post, hashtags(post.text))
+    added = _sync_mentions(post, mentions(post.text), notified=not notify)
+    if added and notify and post.is_published:
+        jobs.enqueue(notify_mentions, post.pk)
+
+
+def published(post):
+    """Запись стала видна: дата в ссылках на теги и уведомления."""
+    PostTag.objects.filter(post=post).update(pub_date=post.pub_date)
+    if Mention.objects.filter(post=post, notified=False).exists():
+        jobs.enqueue(notify_mentions, post.pk)
+
+
+def notify_mentions(post_id):
+    """Письма упомянутым в записи, которых ещё не уведомляли."""
+    post = Post.objects.filter(pk=post_id).select_related("author").first()
+    if post is None:
+        return
+    pending = list(
+        Mention.objects.filter(post=post, notified=False).select_related(
+            "user"
+        )
+    )
+    url = settings.SITE_URL + post.get_absolute_url()
+    for mention in pending:
+        if mention.user.email:
+            send_mail(
+                "Вас упомянули в записи",
+                f"Пользователь {post.author} упоминает вас в записи {url}",
+                None,
+                [mention.user.email],
+            )
+    Mention.objects.filter(
+        id__in=[mention.id for mention in pending]
+    ).update(notified=True)
+
+
+def backfill(batch_size=1000):
+    """Извлекает теги и упоминания из всех записей без уведомлений.
+    Возвращает число записей."""
+    done = 0
+    last = 0
+    posts = Post.all_objects.order_by("pk").only(
+        "pk", "text", "author_id", "pub_date", "status"
+    )
+    while True:
+        batch = list(posts.filter(pk__gt=last)[:batch_size])
+        if not batch:
+            return done
+        for post in batch:
+            extract(post, notify=False)
+        done += len(batch)
+        last = batch[-1].pk
@@ -0,0 +1,154 @@
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.paginator import ApproximateCountPaginator
+
+from ..models import Group, GroupScore, Post
+
+User = get_user_model()
+
+
+class PostAdminTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.user = User.objects.create_user(username='auth')
+        cls.spammer = User.objects.create_user(username='spammer')
+        cls.group = Group.objects.create(
+            title='Заголовок',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.admin_client = Client()
+        self.admin_client.force_login(PostAdminTests.admin)
+        self.url = reverse('admin:posts_post_changelist')
+        self.posts = [
+            Post.objects.create(author=PostAdminTests.user, text=f'Пост {i}')
+            for i in range(3)
+        ]
+
+    def act(self, action, posts, **extra):
+        data = {
+            'action': action,
+            helpers.ACTION_CHECKBOX_NAME: [post.pk for post in posts],
+            **extra,
+        }
+        return self.admin_client.post(self.url, data)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Список записей не делает запросов на каждую строку."""
+        self.admin_client.get(self.url)
+        with CaptureQueriesContext(connection) as before:
+            self.admin_client.get(self.url)
+        Post.objects.bulk_create(
+            Post(author=PostAdminTests.spammer, text='Ещё', group=self.group)
+            for _ in range(20)
+        )
+        with CaptureQueriesContext(connection) as after:
+            self.admin_client.get(self.url)
+        self.assertEqual(len(after), len(before))
+
+    def test_move_to_group(self):
+        """Перенос в группу: промежуточная форма и один UPDATE."""
+        response = self.act('move_to_group', self.posts[:2])
+        self.assertContains(response, 'Выбрано записей: 2.')
+        self.act(
+            'move_to_group',
+            self.posts[:2],
+            group=PostAdminTests.group.pk,
+            apply='1',
+        )
+        self.assertEqual(
+            Post.objects.filter(group=PostAdminTests.group).count(), 2
+        )
+
+    def test_move_to_group_moves_trending_score(self):
+        """Перенос забирает рейтинг у старой группы и отдаёт новой."""
+        old = Group.objects.create(title='Старая', slug='old-slug')
+        posts = [
+            Post.objects.create(
+                author=PostAdminTests.user, text='В старой группе', group=old
+            )
+            for _ in range(2)
+        ]
+        self.assertTrue(GroupScore.objects.filter(group=old).exists())
+        self.act(
+            'move_to_group', posts, group=PostAdminTests.group.pk, apply='1'
+        )
+        self.assertEqual(
+            list(GroupScore.objects.values_list('group_id', flat=True)),
+            [PostAdminTests.group.pk],
+        )
+
+    def test_soft_delete(self):
+        """Массовое удаление скрывает записи, не стирая их."""
+        self.act('soft_delete', self.posts[:2])
+        self.assertEqual(Post.objects.count(), 1)
+        self.assertEqual(
+            Post.all_objects.filter(status=Post.DELETED).count(), 2
+        )
+
+    def test_ban_authors(self):
+        """Блокировка выключает авторов и скрывает все их записи."""
+        spam = Post.objects.create(author=PostAdminTests.spammer, text='Спам')
+        Post.objects.create(author=PostAdminTests.spammer, text='Спам 2')
+        self.act('ban_authors', [spam])
+        PostAdminTests.spammer.refresh_from_db()
+        self.assertFalse(PostAdminTests.spammer.is_active)
+        self.assertFalse(
+            Post.objects.filter(author=PostAdminTests.spammer).exists()
+        )
+        self.assertEqual(Post.objects.count(), 3)
+
+    def test_default_delete_action_removed(self):
+        """Стандартного удаления, загружающего все объекты, нет."""
+        response = self.admin_client.get(self.url)
+        self.assertNotContains(response, 'delete_selected')
+
+    def test_paginator_counts_exactly_below_threshold(self):
+        """Ниже порога число записей считается точно."""
+        paginator = ApproximateCountPaginator(Post.objects.all(), 10)
+        self.assertEqual(paginator.count, 3)
+
+    @override_settings(PAGINATOR_COUNT_THRESHOLD=2)
+    def test_paginator_estimates_above_threshold(self):
+        """Выше порога список без фильтров оценивается без COUNT(*)."""
+        self.posts[1].delete()
+        paginator = ApproximateCountPaginator(Post.all_objects.all(), 10)
+        with CaptureQueriesContext(connection) as queries:
+            count = paginator.count
+        self.assertGreaterEqual(count, 2)
+        self.assertTrue(
+            all('LIMIT' in query['sql'] or 'MAX(' in query['sql']
+                for query in queries)
+        )
+
+    @override_settings(PAGINATOR_COUNT_THRESHOLD=2)
+    def test_paginator_counts_filtered_list_exactly(self):
+        """Отфильтрованный список выше порога считается точно."""
+        paginator = ApproximateCountPaginator(
+            Post.objects.filter(author=PostAdminTests.user), 10
+        )
+        self.assertEqual(paginator.count, 3)
+
+    def test_changelist_skips_full_count(self):
+        """Список с фильтром не считает ещё и всю таблицу."""
+        with CaptureQueriesContext(connection) as queries:
+            self.admin_client.get(self.url, {'group__id__exact': 1})
+        counts = [
+            query for query in queries
+            if 'COUNT(*)' in query['sql'] and '"posts_post"' in query['sql']
+        ]
+        self.assertEqual(len(counts), 1)
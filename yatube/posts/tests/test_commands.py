@@ -0,0 +1,191 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import engines
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.models import KVStore
+
+from core import template_cache
+
+from ..models import Post
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class CleanupMediaCommandTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def create_post(self, name):
+        post = Post.objects.create(
+            author=CleanupMediaCommandTests.user,
+            text='Тестовый пост',
+            image=SimpleUploadedFile(
+                name=name, content=SMALL_GIF, content_type='image/gif'
+            ),
+        )
+        thumbnail = get_thumbnail(post.image, '320x113', crop='center')
+        return post, thumbnail
+
+    def media_path(self, name):
+        return os.path.join(TEMP_MEDIA_ROOT, name)
+
+    def test_orphaned_image_and_thumbnails_removed(self):
+        """Картинки удалённых постов и их миниатюры удаляются."""
+        live, live_thumbnail = self.create_post('live.gif')
+        orphan, orphan_thumbnail = self.create_post('orphan.gif')
+        orphan_name = orphan.image.name
+        orphan.delete()
+
+        call_command('cleanup_media', '--min-age=0', stdout=StringIO())
+
+        self.assertTrue(os.path.exists(self.media_path(live.image.name)))
+        self.assertTrue(
+            os.path.exists(self.media_path(live_thumbnail.name))
+        )
+        self.assertFalse(os.path.exists(self.media_path(orphan_name)))
+        self.assertFalse(
+            os.path.exists(self.media_path(orphan_thumbnail.name))
+        )
+        self.assertFalse(
+            KVStore.objects.filter(value__contains=orphan_name).exists()
+        )
+
+    def test_unknown_thumbnail_file_removed(self):
+        """Файл миниатюры без записи в хранилище sorl удаляется."""
+        live, live_thumbnail = self.create_post('kept.gif')
+        stray = self.media_path('cache/00/00/stray.jpg')
+        os.makedirs(os.path.dirname(stray), exist_ok=True)
+        with open(stray, 'wb') as file:
+            file.write(SMALL_GIF)
+
+        call_command('cleanup_media', '--min-age=0', stdout=StringIO())
+
+        self.assertFalse(os.path.exists(stray))
+        self.assertTrue(
+            os.path.exists(self.media_path(live_thumbnail.name))
+        )
+
+    def test_dry_run_keeps_files(self):
+        """В режиме --dry-run ничего не удаляется."""
+        orphan, orphan_thumbnail = self.create_post('dry.gif')
+        orphan_name = orphan.image.name
+        orphan.delete()
+        out = StringIO()
+
+        call_command('cleanup_media', '--dry-run', '--min-age=0', stdout=out)
+
+        self.assertTrue(os.path.exists(self.media_path(orphan_name)))
+        self.assertTrue(
+            os.path.exists(self.media_path(orphan_thumbnail.name))
+        )
+        self.assertIn(orphan_name, out.getvalue())
+
+    def test_recent_files_kept(self):
+        """Свежие файлы не удаляются: их пост может быть ещё не сохранён."""
+        orphan, orphan_thumbnail = self.create_post('fresh.gif')
+        orphan_name = orphan.image.name
+        orphan.delete()
+        old = time.time() - 7200
+        os.utime(self.media_path(orphan_thumbnail.name), (old, old))
+
+        call_command('cleanup_media', '--min-age=3600', stdout=StringIO())
+
+        self.assertTrue(os.path.exists(self.media_path(orphan_name)))
+        self.assertFalse(
+            os.path.exists(self.media_path(orphan_thumbnail.name))
+        )
+
+
+class ClearExpiredSessionsCommandTests(TestCase):
+
+    def create_session(self, key, expire_date):
+        Session.objects.create(
+            session_key=key, session_data='', expire_date=expire_date
+        )
+
+    def test_only_expired_sessions_removed(self):
+        """Просроченные сессии удаляются порциями, живые остаются."""
+        now = timezone.now()
+        for number in range(5):
+            self.create_session(f'expired{number}', now - timedelta(hours=1))
+        self.create_session('alive', now + timedelta(hours=1))
+        out = StringIO()
+        call_command('clear_expired_sessions', '--batch-size=2', stdout=out)
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            ['alive'],
+        )
+        self.assertIn('5', out.getvalue())
+
+    @override_settings(
+        SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies'
+    )
+    def test_cookie_sessions_skipped(self):
+        """Для сессий в cookie команде нечего удалять."""
+        self.create_session('expired', timezone.now() - timedelta(hours=1))
+        call_command('clear_expired_sessions', stdout=StringIO())
+        self.assertTrue(Session.objects.exists())
+
+
+class TemplateCacheTests(TestCase):
+
+    @override_settings(TEMPLATES=[{
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [settings.TEMPLATES_DIR],
+        'OPTIONS': {
+            'loaders': [(
+                'django.template.loaders.cached.Loader',
+                settings.TEMPLATE_LOADERS,
+            )],
+        },
+    }])
+    def test_warm_up_fills_cached_loader(self):
+        """Прогрев компилирует все шаблоны проекта заранее."""
+        compiled = template_cache.warm_up()
+        loader = engines['django'].engine.template_loaders[0]
+        self.assertGreater(compiled, 0)
+        self.assertEqual(len(loader.get_template_cache), compiled)
+        self.assertIn('includes/post.html', loader.get_template_cache)
+
+    def test_warm_up_skipped_without_cache(self):
+        """Без кэширующего загрузчика прогрев ничего не делает."""
+        self.assertEqual(template_cache.warm_up(), 0)
+
+    def test_benchmark_reports_both_modes(self):
+        """Замер выводит время без кэша и с кэшем."""
+        out = StringIO()
+        call_command('benchmark_templates', '--iterations=1', stdout=out)
+        self.assertIn('без кэша', out.getvalue())
+        self.assertIn('с кэшем', out.getvalue())
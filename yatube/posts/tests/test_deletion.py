@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Comment, Post
+
+User = get_user_model()
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostDeletionTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(PostDeletionTests.user)
+        self.post = Post.objects.create(
+            author=PostDeletionTests.user,
+            text='Тестовый пост',
+            image=SimpleUploadedFile(
+                name='deleted.gif',
+                content=b'GIF89a',
+                content_type='image/gif',
+            ),
+        )
+        Comment.objects.create(
+            post=self.post, author=PostDeletionTests.other, text='Коммент'
+        )
+
+    def test_deleted_post_hidden_from_feeds(self):
+        """Удалённая запись пропадает из лент, но остаётся в базе."""
+        self.authorized_client.get(
+            reverse('posts:post_delete', args=(self.post.pk,))
+        )
+        self.assertFalse(Post.objects.filter(pk=self.post.pk).exists())
+        self.assertTrue(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertEqual(Comment.objects.count(), 1)
+        response = self.authorized_client.get(
+            reverse('posts:profile', args=('auth',))
+        )
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    def test_only_author_can_delete(self):
+        """Чужую запись удалить нельзя."""
+        client = Client()
+        client.force_login(PostDeletionTests.other)
+        client.get(reverse('posts:post_delete', args=(self.post.pk,)))
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_restore_within_window(self):
+        """Запись можно восстановить в течение окна восстановления."""
+        self.authorized_client.get(
+            reverse('posts:post_delete', args=(self.post.pk,))
+        )
+        self.authorized_client.get(
+            reverse('posts:post_restore', args=(self.post.pk,))
+        )
+        self.assertTrue(Post.objects.filter(pk=self.post.pk).exists())
+
+    def test_purge_removes_expired_posts(self):
+        """Очистка стирает просроченные записи с комментариями и файлом."""
+        image = self.post.image
+        Post.objects.filter(pk=self.post.pk).update(
+            status=Post.DELETED,
+            deleted_at=timezone.now() - settings.POST_RESTORE_WINDOW
+            - timedelta(minutes=1)
+        )
+        fresh = Post.objects.create(
+            author=PostDeletionTests.user, text='Недавно удалён'
+        )
+        Post.objects.filter(pk=fresh.pk).update(
+            status=Post.DELETED, deleted_at=timezone.now()
+        )
+
+        call_command('purge_posts', '--batch-size=1', stdout=StringIO())
+
+        self.assertFalse(Post.all_objects.filter(pk=self.post.pk).exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(image.storage.exists(image.name))
+        self.assertTrue(Post.all_objects.filter(pk=fresh.pk).exists())
@@ -0,0 +1,99 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import duplicates, similarity
+from ..models import Group, Post, PostBucket, PostSignature
+
+User = get_user_model()
+
+TEXT = (
+    'Продаю велосипед в хорошем состоянии, почти новый, '
+    'катался всего одно лето, звоните вечером'
+)
+
+
+class DuplicateTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Заголовок',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.second_group = Group.objects.create(
+            title='Другая',
+            slug='other-slug',
+            description='Другое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_signature_and_buckets_saved(self):
+        """При сохранении записи сохраняются подпись и корзины."""
+        post = Post.objects.create(author=DuplicateTests.user, text=TEXT)
+        self.assertEqual(
+            similarity.unpack(PostSignature.objects.get(post=post).data),
+            similarity.signature(TEXT),
+        )
+        self.assertEqual(PostBucket.objects.filter(post=post).count(), 16)
+
+    def test_repost_marked_and_collapsed(self):
+        """Повтор своей записи отмечается и сворачивается в лентах."""
+        original = Post.objects.create(
+            author=DuplicateTests.user, text=TEXT, group=DuplicateTests.group
+        )
+        repost = Post.objects.create(
+            author=DuplicateTests.user,
+            text=TEXT + '!',
+            group=DuplicateTests.second_group,
+        )
+        foreign = Post.objects.create(author=DuplicateTests.other, text=TEXT)
+        repost.refresh_from_db()
+        foreign.refresh_from_db()
+        self.assertEqual(repost.duplicate_of, original)
+        self.assertIsNone(foreign.duplicate_of)
+        index = self.client.get(reverse('posts:index'))
+        self.assertNotIn(repost, index.context['page_obj'])
+        self.assertIn(foreign, index.context['page_obj'])
+        group = self.client.get(
+            reverse('posts:group_list', args=('other-slug',))
+        )
+        self.assertIn(repost, group.context['page_obj'])
+
+    def test_edit_updates_index(self):
+        """Правка текста пересчитывает подпись и отметку повтора."""
+        original = Post.objects.create(author=DuplicateTests.user, text=TEXT)
+        post = Post.objects.create(
+            author=DuplicateTests.user, text='Совсем другой текст записи'
+        )
+        self.assertIsNone(post.duplicate_of_id)
+        post.text = TEXT
+        post.save()
+        self.assertEqual(post.duplicate_of_id, original.pk)
+        self.assertEqual(duplicates.similar(
+            similarity.signature(TEXT), exclude=original.pk
+        ), [post.pk])
+
+    def test_backfill_command(self):
+        """Команда досчитывает подписи порциями и отмечает повторы."""
+        Post.objects.bulk_create(
+            Post(author=DuplicateTests.user, text=TEXT) for _ in range(5)
+        )
+        out = StringIO()
+        call_command('index_duplicates', '--batch-size=2', stdout=out)
+        self.assertIn('5', out.getvalue())
+        self.assertEqual(PostSignature.objects.count(), 5)
+        self.assertEqual(
+            Post.objects.filter(duplicate_of__isnull=False).count(), 4
+        )
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import history
+from ..models import Post
+
+User = get_user_model()
+
+
+class PostHistoryTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(PostHistoryTests.user)
+        self.post = Post.objects.create(
+            author=PostHistoryTests.user, text='Первая версия текста'
+        )
+
+    def edit(self, text):
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=(self.post.pk,)),
+            data={'text': text},
+        )
+
+    def test_diff_roundtrip(self):
+        """Разница между текстами восстанавливает новый текст."""
+        old = 'Мама мыла раму.\nПапа читал газету.'
+        new = 'Мама мыла окно.\nПапа читал газету, а кот спал.'
+        diff = history.make_diff(old, new)
+        self.assertEqual(history.apply_diff(old, diff), new)
+        self.assertLess(len(''.join(part for *_, part in diff)), len(new))
+
+    def test_every_revision_restored(self):
+        """Любая версия восстанавливается, полные тексты периодичны."""
+        texts = ['Первая версия текста']
+        for number in range(2, 15):
+            texts.append(f'{texts[-1]} правка {number}')
+            self.edit(texts[-1])
+        revisions = self.post.revisions.all()
+        self.assertEqual(len(revisions), len(texts))
+        for revision in revisions:
+            with self.subTest(number=revision.number):
+                self.assertEqual(
+                    history.revision_text(self.post, revision.number),
+                    texts[revision.number - 1],
+                )
+        snapshots = [rev.number for rev in revisions if rev.is_snapshot]
+        every = settings.POST_HISTORY_SNAPSHOT_EVERY
+        self.assertEqual(snapshots, list(range(1, len(texts) + 1, every)))
+
+    def test_unchanged_edit_not_recorded(self):
+        """Сохранение без изменений не создаёт версию."""
+        self.edit('Первая версия текста')
+        self.assertFalse(self.post.revisions.exists())
+
+    def test_history_page(self):
+        """Страница истории показывает выбранную версию."""
+        self.edit('Вторая версия текста')
+        response = self.authorized_client.get(
+            reverse('posts:post_history', args=(self.post.pk,)),
+            {'rev': 1},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.context['text'], 'Первая версия текста')
+
+    def test_history_page_bad_revision(self):
+        """Неверный или несуществующий номер версии не показывает текст."""
+        self.edit('Вторая версия текста')
+        for number in ('²', '1' * 30, '999'):
+            with self.subTest(number=number):
+                response = self.authorized_client.get(
+                    reverse('posts:post_history', args=(self.post.pk,)),
+                    {'rev': number},
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertIsNone(response.context['text'])
@@ -0,0 +1,68 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+
+CALLS = []
+
+
+def remember(value, suffix=''):
+    CALLS.append(f'{value}{suffix}')
+
+
+def explode():
+    raise RuntimeError('сломалось')
+
+
+@override_settings(JOBS_RETRY_DELAY=timedelta(seconds=10))
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_jobs_run_by_priority_and_removed(self):
+        """Задачи выполняются по приоритету и удаляются после успеха."""
+        jobs.enqueue(remember, 'low')
+        jobs.enqueue(remember, 'high', priority=5, suffix='!')
+        jobs.enqueue(
+            remember, 'later', run_at=timezone.now() + timedelta(hours=1)
+        )
+        out = StringIO()
+        call_command('run_jobs', '--batch-size=1', stdout=out)
+        self.assertEqual(CALLS, ['high!', 'low'])
+        self.assertEqual(
+            list(Job.objects.values_list('args', flat=True)), [['later']]
+        )
+        self.assertIn('2', out.getvalue())
+
+    def test_failed_job_retried_with_backoff(self):
+        """Упавшая задача откладывается со всё большей паузой."""
+        job = jobs.enqueue(explode)
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('сломалось', job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+        self.assertEqual(jobs.retry_delay(3), timedelta(seconds=40))
+
+    def test_job_failed_after_max_attempts(self):
+        """После последней попытки задача помечается невыполненной."""
+        job = jobs.enqueue(explode)
+        Job.objects.filter(pk=job.pk).update(max_attempts=1)
+        jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_claim_is_exclusive(self):
+        """Задачу забирает только один обработчик, зависшая возвращается."""
+        jobs.enqueue(remember, 'once')
+        self.assertEqual(len(jobs.claim('first')), 1)
+        self.assertEqual(jobs.claim('second'), [])
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(len(jobs.claim('second')), 1)
@@ -0,0 +1,218 @@
+import asyncio
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import live, scheduling
+from ..models import Follow, Group, Post
+
+User = get_user_model()
+
+
+class Inbox:
+    """Подписчик, складывающий подходящие уведомления в список."""
+
+    def __init__(self, accepts):
+        self.accepts = accepts
+        self.messages = []
+
+    def deliver(self, message):
+        if self.accepts(message):
+            self.messages.append(message)
+
+    @property
+    def ids(self):
+        return [message['id'] for message in self.messages]
+
+
+@override_settings(LIVE_FEED_POLL_INTERVAL=0)
+class LiveFeedTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.author = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Заголовок',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other_group = Group.objects.create(
+            title='Другая группа',
+            slug='other-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        live._recent_ids.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(LiveFeedTests.user)
+
+    def subscribe(self, query, client=None):
+        request = (client or self.guest_client).get(
+            reverse('posts:index'), query
+        ).wsgi_request
+        inbox = live.broker.subscribe(Inbox(live.feed_filter(request)))
+        self.addCleanup(live.broker.unsubscribe, inbox)
+        return inbox
+
+    def create_post(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(
+                author=LiveFeedTests.author, text='Новый пост', **kwargs
+            )
+
+    def test_new_post_published_to_index(self):
+        """Новая запись попадает подписчикам главной ленты."""
+        inbox = self.subscribe({'feed': 'index'})
+        post = self.create_post()
+        self.assertEqual(inbox.ids, [post.pk])
+
+    def test_group_feed_receives_only_its_posts(self):
+        """Лента группы получает только записи своей группы."""
+        inbox = self.subscribe({'feed': 'group', 'slug': 'test-slug'})
+        self.create_post(group=LiveFeedTests.other_group)
+        post = self.create_post(group=LiveFeedTests.group)
+        self.assertEqual(inbox.ids, [post.pk])
+
+    def test_follow_feed_receives_followed_authors(self):
+        """Лента подписок получает записи только избранных авторов."""
+        Follow.objects.create(
+            user=LiveFeedTests.user, author=LiveFeedTests.author
+        )
+        inbox = self.subscribe({'feed': 'follow'}, self.authorized_client)
+        post = self.create_post()
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(author=LiveFeedTests.user, text='Свой пост')
+        self.assertEqual(inbox.ids, [post.pk])
+
+    def test_watcher_publishes_posts_from_other_processes(self):
+        """Записи, сохранённые без сигнала, находит опрос базы."""
+        inbox = self.subscribe({'feed': 'index'})
+        watcher = live.PostWatcher()
+        watcher.batch_size = 2
+        watcher.poll()
+        listed_at = timezone.now()
+        Post.objects.bulk_create(
+            Post(author=LiveFeedTests.author, text=f'Чужой пост {i}',
+                 listed_at=listed_at)
+            for i in range(5)
+        )
+        watcher.poll()
+        self.assertEqual(
+            inbox.ids, list(Post.objects.order_by('id').values_list(
+                'id', flat=True
+            ))
+        )
+
+    def test_watcher_publishes_late_scheduled_posts(self):
+        """Отложенная запись, опубликованная с опозданием, тоже
+        рассылается."""
+        post = Post.objects.create(
+            author=LiveFeedTests.author,
+            text='Отложенный пост',
+            status=Post.SCHEDULED,
+            publish_at=timezone.now() - timedelta(hours=1),
+        )
+        inbox = self.subscribe({'feed': 'index'})
+        watcher = live.PostWatcher()
+        scheduling.publish_due()
+        watcher.poll()
+        self.assertEqual(inbox.ids, [post.pk])
+
+    def stream(self, query, on_body):
+        """Прогоняет sse_application и возвращает отправленные события.
+        on_body получает тело и возвращает True, чтобы отключиться."""
+        events = []
+
+        async def run():
+            disconnected = asyncio.Event()
+
+            async def receive():
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(event):
+                events.append(event)
+                if event.get('body') and on_body(event['body'].decode()):
+                    disconnected.set()
+
+            await live.sse_application({
+                'type': 'http',
+                'method': 'GET',
+                'path': reverse('posts:live_feed'),
+                'query_string': urlencode(query).encode(),
+                'headers': [],
+            }, receive, send)
+
+        async_to_sync(run)()
+        return events
+
+    def test_sse_application_streams_posts(self):
+        """ASGI-поток отдаёт заголовки, retry и новые записи."""
+        post = Post.objects.create(
+            author=LiveFeedTests.author, text='Новый пост'
+        )
+
+        def on_body(body):
+            if body == live.RETRY:
+                live.publish_post(post)
+                return False
+            return True
+
+        events = self.stream({'feed': 'index'}, on_body)
+        self.assertEqual(events[0]['status'], HTTPStatus.OK)
+        self.assertIn(
+            (b'content-type', b'text/event-stream'), events[0]['headers']
+        )
+        self.assertEqual(events[1]['body'].decode(), live.RETRY)
+        self.assertEqual(
+            events[2]['body'].decode(),
+            live.sse_message(
+                {'id': post.pk, 'author': post.author_id, 'group': None}
+            ),
+        )
+        self.assertEqual(len(live.broker), 0)
+
+    def test_sse_application_checks_feed(self):
+        """ASGI-поток проверяет ленту так же, как страницы."""
+        for query, status in (
+            ({'feed': 'follow'}, HTTPStatus.FORBIDDEN),
+            ({'feed': 'group', 'slug': 'missing'}, HTTPStatus.NOT_FOUND),
+        ):
+            with self.subTest(query=query):
+                events = self.stream(query, lambda body: True)
+                self.assertEqual(events[0]['status'], status)
+
+    def test_wsgi_view_does_not_hold_connection(self):
+        """Под WSGI поток событий сразу отвечает 204."""
+        response = self.guest_client.get(
+            reverse('posts:live_feed'), {'feed': 'index'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NO_CONTENT)
+
+    def test_feed_pages_subscribe_only_when_enabled(self):
+        """Страницы подключают живую ленту, только если она включена."""
+        url = reverse('posts:group_list', args=('test-slug',))
+        for enabled in (False, True):
+            with self.subTest(enabled=enabled):
+                with self.settings(LIVE_FEED_ENABLED=enabled):
+                    response = self.guest_client.get(url)
+                self.assertEqual(
+                    'EventSource' in response.content.decode(), enabled
+                )
+
+    def test_follow_stream_forbidden_for_guest(self):
+        """Гость не может подписаться на ленту избранных авторов."""
+        response = self.guest_client.get(
+            reverse('posts:live_feed'), {'feed': 'follow'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.core.cache.backends.base import memcache_key_warnings
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import profiles
+from ..models import Follow, Post
+
+User = get_user_model()
+
+
+class UserSummaryTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='auth', first_name='Лев', last_name='Толстой'
+        )
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(
+            author=cls.user, text='Тестовый пост'
+        )
+
+    def setUp(self):
+        profiles.clear()
+        self.guest_client = Client()
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            self.guest_client.get(url)
+        return [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "auth_user"' in query['sql']
+        ]
+
+    def test_cached_profile_skips_user_table(self):
+        """Повторный показ профиля и записи не обращается к пользователям."""
+        urls = (
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        )
+        for url in urls:
+            self.guest_client.get(url)
+            with self.subTest(url=url):
+                self.assertEqual(self.user_queries(url), [])
+
+    def test_counters_invalidated(self):
+        """Новые записи и подписки сбрасывают сводку."""
+        self.assertEqual(profiles.summary('auth')['posts_count'], 1)
+        Post.objects.create(author=UserSummaryTests.user, text='Ещё пост')
+        Follow.objects.create(
+            user=UserSummaryTests.reader, author=UserSummaryTests.user
+        )
+        data = profiles.summary('auth')
+        self.assertEqual(data['posts_count'], 2)
+        self.assertEqual(data['followers_count'], 1)
+        self.assertEqual(profiles.summary('reader')['following_count'], 1)
+
+    def test_rename_invalidated(self):
+        """После смены имени старое имя больше не находится."""
+        profiles.summary('reader')
+        reader = UserSummaryTests.reader
+        reader.username = 'renamed'
+        reader.save()
+        self.assertIsNone(profiles.summary('reader'))
+        user = profiles.get_user('renamed')
+        self.assertEqual(user.pk, reader.pk)
+        self.assertEqual(user, reader)
+
+    def test_odd_username_is_not_found(self):
+        """Имя с пробелами или слишком длинное даёт 404, а не ошибку кэша."""
+        for username in ('a b', 'x' * 300):
+            with self.subTest(username=username):
+                response = self.guest_client.get(
+                    reverse('posts:profile', args=(username,))
+                )
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(
+                    list(memcache_key_warnings(profiles._name_key(username))),
+                    [],
+                )
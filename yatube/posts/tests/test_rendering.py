@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import rendering
+from ..models import Post
+
+User = get_user_model()
+
+
+class RenderingTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(RenderingTests.user)
+
+    def test_render(self):
+        """Текст экранируется, ссылки, теги и упоминания становятся
+        ссылками."""
+        html = rendering.render(
+            '<b>Привет</b>, @auth и @nobody!\nСм. https://example.com/#top'
+            '\n\nПро #Django',
+            {'auth'},
+        )
+        self.assertIn('&lt;b&gt;Привет&lt;/b&gt;', html)
+        self.assertIn('<a href="/profile/auth/">@auth</a>', html)
+        self.assertIn('@nobody!', html)
+        self.assertIn(
+            '<a href="https://example.com/#top" rel="nofollow">', html
+        )
+        self.assertIn('<a href="/tags/django/">#Django</a></p>', html)
+        self.assertIn('<br>', html)
+        self.assertEqual(html.count('<p>'), 2)
+
+    @override_settings(POST_PREVIEW_LENGTH=20)
+    def test_stored_on_save_and_edit(self):
+        """HTML и превью сохраняются при создании и правке записи."""
+        self.client.post(
+            reverse('posts:post_create'),
+            {'text': 'Очень длинный текст для превью в ленте #тег'},
+        )
+        post = Post.objects.get()
+        self.assertIn(
+            reverse('posts:tag_list', args=('тег',)), post.text_html
+        )
+        self.assertIn('…', post.preview)
+        self.assertNotIn('#тег', post.preview)
+        self.client.post(
+            reverse('posts:post_edit', args=(post.pk,)),
+            {'text': 'Короткий'},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p>Короткий</p>')
+        self.assertEqual(post.preview, '<p>Короткий</p>')
+
+    @override_settings(POST_PREVIEW_LENGTH=20)
+    def test_feed_reads_only_preview(self):
+        """Лента выводит превью и не читает полный текст."""
+        Post.objects.create(
+            author=RenderingTests.user, text='Начало записи ' + 'x' * 500
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'Начало записи')
+        self.assertNotContains(response, 'x' * 50)
+        self.assertFalse(
+            any('"posts_post"."text"' in query['sql'] for query in queries)
+        )
+
+    def test_backfill_command(self):
+        """Команда заполняет HTML записей, созданных без него."""
+        Post.objects.bulk_create(
+            Post(author=RenderingTests.user, text=f'Про #старое {i}')
+            for i in range(3)
+        )
+        out = StringIO()
+        call_command('render_posts', '--batch-size=2', stdout=out)
+        self.assertIn('3', out.getvalue())
+        url = reverse('posts:tag_list', args=('старое',))
+        for post in Post.objects.all():
+            self.assertIn(url, post.text_html)
+            self.assertTrue(post.preview)
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Post
+from ..signals import post_published
+
+User = get_user_model()
+
+
+class PostSchedulingTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(PostSchedulingTests.user)
+        self.published = []
+        post_published.connect(self.on_published, sender=Post)
+        self.addCleanup(
+            post_published.disconnect, self.on_published, sender=Post
+        )
+
+    def on_published(self, sender, instance, **kwargs):
+        self.published.append(instance.pk)
+
+    def local_input(self, delta):
+        moment = timezone.localtime() + delta
+        return moment.strftime('%Y-%m-%dT%H:%M')
+
+    def create_post(self, text='Тестовый пост', **kwargs):
+        data = {'text': text}
+        data.update(kwargs)
+        self.authorized_client.post(reverse('posts:post_create'), data)
+        return Post.all_objects.get(text=text)
+
+    def test_draft_hidden_from_feeds(self):
+        """Черновик не попадает в ленты и виден только автору."""
+        post = self.create_post(draft='on')
+        self.assertEqual(post.status, Post.DRAFT)
+        self.assertEqual(self.published, [])
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotIn(post, response.context['page_obj'])
+        url = reverse('posts:post_detail', kwargs={'post_id': post.pk})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.authorized_client.get(url).status_code, 200)
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': 'auth'})
+        )
+        self.assertIn(post, response.context['drafts'])
+
+    def test_past_date_publishes_immediately(self):
+        """Запись без будущей даты публикуется сразу."""
+        post = self.create_post(
+            publish_at=self.local_input(timedelta(hours=-1))
+        )
+        self.assertEqual(post.status, Post.PUBLISHED)
+        self.assertEqual(self.published, [post.pk])
+
+    def test_scheduled_post_published_by_command(self):
+        """Команда публикует наступившие записи и шлёт сигнал."""
+        post = self.create_post(
+            publish_at=self.local_input(timedelta(days=1))
+        )
+        later = self.create_post(
+            text='Позже',
+            publish_at=self.local_input(timedelta(days=2))
+        )
+        self.assertEqual(post.status, Post.SCHEDULED)
+        due = timezone.now() - timedelta(minutes=1)
+        Post.all_objects.filter(pk=post.pk).update(publish_at=due)
+        out = StringIO()
+        call_command('publish_scheduled', stdout=out)
+        post.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual(post.status, Post.PUBLISHED)
+        self.assertEqual(post.pub_date, due)
+        self.assertEqual(later.status, Post.SCHEDULED)
+        self.assertEqual(self.published, [post.pk])
+
+    def test_publishing_draft_on_edit(self):
+        """Снятие отметки черновика публикует запись."""
+        post = self.create_post(draft='on')
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            {'text': 'Готово'},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.status, Post.PUBLISHED)
+        self.assertEqual(post.text, 'Готово')
+        self.assertEqual(self.published, [post.pk])
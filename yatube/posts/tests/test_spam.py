@@ -0,0 +1,159 @@
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+
+from .. import similarity, spam
+from ..models import AuthorActivity, Comment, Post
+
+User = get_user_model()
+
+TEXT = 'Купите наши замечательные слоны со скидкой только сегодня и завтра'
+
+
+class SpamTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Обычный пост')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(SpamTests.user)
+
+    def create_post(self, text):
+        self.client.post(reverse('posts:post_create'), {'text': text})
+        return Post.all_objects.latest('pk')
+
+    def test_similarity_of_near_duplicates(self):
+        """Подписи похожих текстов близки, разных — нет."""
+        first = similarity.signature(TEXT)
+        second = similarity.signature(TEXT + ' и послезавтра')
+        other = similarity.signature('Сегодня в парке гуляли с собакой')
+        self.assertGreater(similarity.similarity(first, second), 0.6)
+        self.assertLess(similarity.similarity(first, other), 0.2)
+        self.assertIsNone(similarity.signature('!!!'))
+
+    def test_links_hide_post_from_feeds(self):
+        """Запись со ссылками не попадает в ленты."""
+        post = self.create_post(
+            ' '.join(f'https://example.com/{i}' for i in range(6))
+        )
+        self.assertEqual(post.status, Post.SPAM)
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotIn(post, response.context['page_obj'])
+        self.assertEqual(
+            self.client.get(reverse('posts:post_edit', args=(post.pk,)))
+            .status_code,
+            404,
+        )
+
+    def test_edit_into_spam_leaves_feeds(self):
+        """Правка опубликованной записи в спам убирает её из лент и
+        сводки автора."""
+        post = self.create_post('Обычная запись')
+        activity = AuthorActivity.objects.filter(
+            author=SpamTests.user, day=timezone.localdate()
+        )
+        posts = activity.get().posts
+        self.client.post(
+            reverse('posts:post_edit', args=(post.pk,)),
+            {'text': ' '.join(f'https://example.com/{i}' for i in range(6))},
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.status, Post.SPAM)
+        response = self.client.get(reverse('posts:index'))
+        self.assertNotIn(post, response.context['page_obj'])
+        self.assertEqual(activity.get().posts, posts - 1)
+
+    @override_settings(SPAM_DUPLICATES_ALLOWED=1, SPAM_DUPLICATE_WEIGHT=1)
+    def test_repeated_edits_not_flagged(self):
+        """Несколько исправлений одной записи — не повтор текста."""
+        post = self.create_post(TEXT)
+        for i in range(3):
+            self.client.post(
+                reverse('posts:post_edit', args=(post.pk,)),
+                {'text': f'{TEXT} {i}'},
+            )
+        post.refresh_from_db()
+        self.assertEqual(post.status, Post.PUBLISHED)
+
+    @override_settings(SPAM_DUPLICATES_ALLOWED=1, SPAM_DUPLICATE_WEIGHT=1)
+    def test_repeated_text_flagged(self):
+        """Повтор одного текста быстро становится спамом."""
+        statuses = [self.create_post(TEXT).status for _ in range(3)]
+        self.assertEqual(
+            statuses, [Post.PUBLISHED, Post.PUBLISHED, Post.SPAM]
+        )
+
+    def test_short_text_from_many_users_not_flagged(self):
+        """Одинаковый короткий текст разных людей — не спам."""
+        for i in range(10):
+            with self.subTest(i=i):
+                user = User.objects.create_user(username=f'reader{i}')
+                self.client.force_login(user)
+                self.client.post(
+                    reverse('posts:add_comment', args=(SpamTests.post.pk,)),
+                    {'text': 'Спасибо за пост!'},
+                )
+                self.assertFalse(Comment.all_objects.latest('pk').is_spam)
+
+    @override_settings(
+        SPAM_VELOCITY_LIMITS={'post': 2, 'comment': 2},
+        SPAM_VELOCITY_WEIGHT=1,
+    )
+    def test_velocity_limit(self):
+        """Слишком частые записи отмечаются как спам."""
+        statuses = [
+            self.create_post(f'Разные тексты номер {i}').status
+            for i in range(3)
+        ]
+        self.assertEqual(statuses[-1], Post.SPAM)
+
+    @override_settings(SPAM_TIME_BUDGET=0, SPAM_BLOCKED_WORDS=('слоны',))
+    def test_checks_over_budget_run_in_background(self):
+        """Не уложившиеся в бюджет проверки выполняет очередь задач."""
+        post = self.create_post(TEXT)
+        self.assertEqual(post.status, Post.PUBLISHED)
+        self.assertTrue(Job.objects.filter(task='posts.spam.recheck'))
+        jobs.run_pending()
+        post.refresh_from_db()
+        self.assertEqual(post.status, Post.SPAM)
+        self.assertFalse(Post.objects.filter(pk=post.pk).exists())
+
+    @override_settings(SPAM_BLOCKED_WORDS=('слоны',))
+    def test_spam_comment_hidden(self):
+        """Комментарий-спам не виден под записью."""
+        self.client.post(
+            reverse('posts:add_comment', args=(SpamTests.post.pk,)),
+            {'text': TEXT},
+        )
+        comment = Comment.all_objects.get()
+        self.assertTrue(comment.is_spam)
+        response = self.client.get(
+            reverse('posts:post_detail', args=(SpamTests.post.pk,))
+        )
+        self.assertEqual(list(response.context['comments']), [])
+
+    def test_admin_returns_post_to_feeds(self):
+        """Модератор возвращает ошибочно отмеченную запись."""
+        post = Post.objects.create(author=SpamTests.user, text=TEXT)
+        spam.flag(post)
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        self.client.force_login(admin)
+        self.client.post(reverse('admin:posts_post_changelist'), {
+            'action': 'not_spam',
+            helpers.ACTION_CHECKBOX_NAME: [post.pk],
+        })
+        post.refresh_from_db()
+        self.assertEqual(post.status, Post.PUBLISHED)
@@ -0,0 +1,111 @@
+import gzip
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.middleware import GZipMiddleware
+from core.views import static_file
+
+CSS = b'body { color: black; }\n' * 100
+
+
+class StaticPipelineTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.source = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        cls.root = tempfile.mkdtemp(dir=settings.BASE_DIR)
+        os.makedirs(os.path.join(cls.source, 'css'))
+        with open(os.path.join(cls.source, 'css', 'site.css'), 'wb') as css:
+            css.write(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(cls.source, ignore_errors=True)
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        settings_override = override_settings(
+            STATICFILES_DIRS=[self.source],
+            STATIC_ROOT=self.root,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'
+            ),
+            INSTALLED_APPS=['django.contrib.staticfiles'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command(
+            'collectstatic', interactive=False, verbosity=0, stdout=StringIO()
+        )
+        self.hashed = staticfiles_storage.stored_name('css/site.css')
+
+    def test_collectstatic_writes_compressed_copies(self):
+        """Сборка статики хэширует имена и кладёт рядом .gz."""
+        self.assertNotEqual(self.hashed, 'css/site.css')
+        path = os.path.join(self.root, self.hashed)
+        with open(path + '.gz', 'rb') as compressed:
+            self.assertEqual(gzip.decompress(compressed.read()), CSS)
+
+    def test_hashed_file_served_compressed_forever(self):
+        """Хэшированный файл отдаётся сжатым и кэшируется надолго."""
+        request = self.factory.get(
+            '/static/' + self.hashed, HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        response = static_file(request, self.hashed)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), CSS)
+
+    def test_original_name_served_plain_with_short_cache(self):
+        """Без поддержки gzip и хэша в имени файл отдаётся как есть."""
+        request = self.factory.get('/static/css/site.css')
+        response = static_file(request, 'css/site.css')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), CSS)
+
+
+class GZipMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get(
+            '/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+
+    def process(self, response):
+        return GZipMiddleware(lambda request: response)(self.request)
+
+    @override_settings(GZIP_LEVEL=1)
+    def test_html_compressed(self):
+        """HTML сжимается с уровнем из настроек."""
+        html = b'<p>' + b'yatube ' * 200 + b'</p>'
+        response = self.process(HttpResponse(html))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response.content, gzip.compress(
+            html, compresslevel=1, mtime=0
+        ))
+
+    def test_event_stream_not_compressed(self):
+        """Поток событий и мелкие ответы не сжимаются."""
+        stream = StreamingHttpResponse(
+            iter([b'data: 1\n\n']), content_type='text/event-stream'
+        )
+        self.assertFalse(
+            self.process(stream).has_header('Content-Encoding')
+        )
+        small = self.process(HttpResponse(b'ok'))
+        self.assertFalse(small.has_header('Content-Encoding'))
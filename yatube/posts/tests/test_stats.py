@@ -0,0 +1,100 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import deletion, stats
+from ..models import AuthorActivity, Comment, Follow, Post
+
+User = get_user_model()
+
+
+class ProfileStatsTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(username='reader')
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def activity(self):
+        return AuthorActivity.objects.get(
+            author=ProfileStatsTests.user, day=timezone.localdate()
+        )
+
+    def test_writes_update_rollup(self):
+        """Записи, комментарии и подписки сразу попадают в сводку."""
+        post = Post.objects.create(
+            author=ProfileStatsTests.user, text='Тестовый пост'
+        )
+        Post.objects.create(author=ProfileStatsTests.user, text='Ещё пост')
+        Comment.objects.create(
+            post=post, author=ProfileStatsTests.reader, text='Комментарий'
+        )
+        follow = Follow.objects.create(
+            user=ProfileStatsTests.reader, author=ProfileStatsTests.user
+        )
+        activity = self.activity()
+        self.assertEqual(
+            (activity.posts, activity.comments, activity.followers), (2, 1, 1)
+        )
+        follow.delete()
+        deletion.soft_delete(post)
+        activity = self.activity()
+        self.assertEqual((activity.posts, activity.followers), (1, 0))
+
+    def test_profile_panel(self):
+        """Профиль показывает статистику по месяцам и карту активности."""
+        Post.objects.create(author=ProfileStatsTests.user, text='Пост')
+        response = self.guest_client.get(
+            reverse('posts:profile', kwargs={'username': 'auth'})
+        )
+        panel = response.context['stats']
+        self.assertEqual(panel['totals']['posts'], 1)
+        self.assertEqual(len(panel['months']), 12)
+        self.assertEqual(panel['months'][-1]['posts'], 1)
+        today = [
+            cell for week in panel['heatmap'] for cell in week
+            if cell['day'] == timezone.localdate()
+        ]
+        self.assertEqual(today[0]['level'], stats.HEATMAP_LEVELS)
+        self.assertContains(response, 'heat-4')
+
+    def test_rebuild_matches_incremental(self):
+        """Пересчёт по истории даёт ту же сводку, что и записи на лету."""
+        post = Post.objects.create(
+            author=ProfileStatsTests.user, text='Тестовый пост'
+        )
+        Comment.objects.create(
+            post=post, author=ProfileStatsTests.reader, text='Комментарий'
+        )
+        Follow.objects.create(
+            user=ProfileStatsTests.reader, author=ProfileStatsTests.user
+        )
+        hidden = Post.objects.create(
+            author=ProfileStatsTests.user, text='Удалённый пост'
+        )
+        Comment.objects.create(
+            post=hidden, author=ProfileStatsTests.reader, text='Комментарий'
+        )
+        deletion.soft_delete(hidden)
+        removed = Post.objects.create(
+            author=ProfileStatsTests.user, text='Удалённый из админки'
+        )
+        Comment.objects.create(
+            post=removed, author=ProfileStatsTests.reader, text='Комментарий'
+        )
+        deletion.soft_delete_many(Post.objects.filter(pk=removed.pk))
+        before = stats.profile_stats(ProfileStatsTests.user.pk)
+        self.assertEqual(before['totals']['comments'], 1)
+        AuthorActivity.objects.all().delete()
+        call_command('rebuild_profile_stats', stdout=StringIO())
+        self.assertEqual(
+            stats.profile_stats(ProfileStatsTests.user.pk), before
+        )
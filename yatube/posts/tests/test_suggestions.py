@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core import jobs
+
+from ..models import Follow, FollowSuggestion
+from ..suggestions import Adjacency
+
+User = get_user_model()
+
+
+class FollowSuggestionTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.friend = User.objects.create_user(username='friend')
+        cls.author = User.objects.create_user(username='author')
+        Follow.objects.create(user=cls.friend, author=cls.author)
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(FollowSuggestionTests.user)
+
+    def suggested(self):
+        return list(
+            FollowSuggestion.objects.filter(
+                user=FollowSuggestionTests.user
+            ).values_list('author__username', flat=True)
+        )
+
+    def test_adjacency_lookup(self):
+        """Списки смежности возвращают соседей по ключу."""
+        adjacency = Adjacency([(1, 2), (1, 3), (4, 1)])
+        self.assertEqual(list(adjacency[1]), [2, 3])
+        self.assertEqual(list(adjacency[4]), [1])
+        self.assertEqual(list(adjacency[2]), [])
+
+    def test_follow_refreshes_suggestions(self):
+        """После подписки рекомендуются авторы, которых читает автор."""
+        self.authorized_client.get(
+            reverse('posts:profile_follow', args=('friend',))
+        )
+        jobs.run_pending()
+        self.assertEqual(self.suggested(), ['author'])
+
+        self.authorized_client.get(
+            reverse('posts:profile_follow', args=('author',))
+        )
+        jobs.run_pending()
+        self.assertEqual(self.suggested(), [])
+
+    def test_suggestions_shown_in_follow_feed(self):
+        """Рекомендации выводятся в ленте подписок."""
+        FollowSuggestion.objects.create(
+            user=FollowSuggestionTests.user,
+            author=FollowSuggestionTests.author,
+            score=1,
+        )
+        response = self.authorized_client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            [item.author for item in response.context['suggestions']],
+            [FollowSuggestionTests.author],
+        )
+
+    def test_rebuild_command(self):
+        """Пакетный пересчёт строит рекомендации для всех."""
+        Follow.objects.create(
+            user=FollowSuggestionTests.user,
+            author=FollowSuggestionTests.friend,
+        )
+        call_command('rebuild_suggestions', stdout=StringIO())
+        self.assertEqual(self.suggested(), ['author'])
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import jobs
+
+from .. import scheduling, tags
+from ..models import Mention, Post, PostTag, Tag
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+)
+class TagTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.reader = User.objects.create_user(
+            username='reader', email='reader@example.com'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(TagTests.user)
+
+    def test_extraction(self):
+        """Теги и упоминания извлекаются без ложных срабатываний."""
+        text = 'Про #Django и #python, пишите на a@b.ru или @reader. &#39;'
+        self.assertEqual(tags.hashtags(text), {'django', 'python'})
+        self.assertEqual(tags.mentions(text), {'reader'})
+
+    def test_tag_feed(self):
+        """Лента тега показывает только опубликованные записи с ним."""
+        post = Post.objects.create(author=TagTests.user, text='Про #Django')
+        Post.objects.create(author=TagTests.user, text='Без тегов')
+        draft = Post.objects.create(
+            author=TagTests.user, text='#django', status=Post.DRAFT
+        )
+        response = self.client.get(reverse('posts:tag_list', args=('django',)))
+        self.assertTemplateUsed(response, 'posts/tag_list.html')
+        self.assertEqual(list(response.context['page_obj']), [post])
+        self.assertNotIn(draft, response.context['page_obj'])
+
+    def test_edit_updates_links_incrementally(self):
+        """Правка меняет только добавленные и удалённые ссылки."""
+        post = Post.objects.create(author=TagTests.user, text='#one #two')
+        kept = PostTag.objects.get(post=post, tag__name='one')
+        self.client.post(
+            reverse('posts:post_edit', args=(post.pk,)),
+            {'text': '#one #three'},
+        )
+        self.assertEqual(
+            set(post.tag_links.values_list('tag__name', flat=True)),
+            {'one', 'three'},
+        )
+        self.assertTrue(PostTag.objects.filter(pk=kept.pk).exists())
+        self.assertTrue(Tag.objects.filter(name='two').exists())
+
+    def test_mention_notified_once(self):
+        """Упомянутый получает одно письмо, даже после правки."""
+        post = Post.objects.create(
+            author=TagTests.user, text='Привет, @reader'
+        )
+        post.text = 'Привет, @reader и @auth'
+        post.save()
+        jobs.run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['reader@example.com'])
+        self.assertIn(post.get_absolute_url(), mail.outbox[0].body)
+        self.assertEqual(Mention.objects.get().user, TagTests.reader)
+
+    def test_scheduled_post_notifies_and_dates_on_publish(self):
+        """Отложенная запись уведомляет и попадает в ленту тега при
+        публикации."""
+        post = Post.objects.create(
+            author=TagTests.user,
+            text='#later для @reader',
+            status=Post.SCHEDULED,
+            publish_at=timezone.now() - timedelta(minutes=1),
+        )
+        jobs.run_pending()
+        self.assertEqual(len(mail.outbox), 0)
+        scheduling.publish_due()
+        jobs.run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(
+            PostTag.objects.get(post=post).pub_date, post.publish_at
+        )
+
+    def test_backfill_command(self):
+        """Команда извлекает теги старых записей без уведомлений."""
+        Post.objects.bulk_create(
+            Post(author=TagTests.user, text=f'#old @reader {i}')
+            for i in range(3)
+        )
+        out = StringIO()
+        call_command('extract_tags', '--batch-size=2', stdout=out)
+        self.assertIn('3', out.getvalue())
+        self.assertEqual(PostTag.objects.count(), 3)
+        self.assertFalse(Mention.objects.filter(notified=False).exists())
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import trending
+from ..models import Comment, Group, GroupScore, Post, PostScore
+
+User = get_user_model()
+
+
+class TrendingTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Заголовок',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.quiet_group = Group.objects.create(
+            title='Тихая группа',
+            slug='quiet-slug',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def create_post(self, **kwargs):
+        return Post.objects.create(
+            author=TrendingTests.user, text='Тестовый пост', **kwargs
+        )
+
+    def comment(self, post, count):
+        for _ in range(count):
+            Comment.objects.create(
+                post=post, author=TrendingTests.user, text='Комментарий'
+            )
+
+    def test_commented_post_ranks_higher(self):
+        """Обсуждаемая запись выше в рейтинге, чем новая без комментариев."""
+        discussed = self.create_post(group=TrendingTests.group)
+        self.comment(discussed, 3)
+        self.create_post(group=TrendingTests.quiet_group)
+        self.assertEqual(PostScore.objects.first().post, discussed)
+        self.assertEqual(GroupScore.objects.first().group, TrendingTests.group)
+
+    def test_old_events_decay(self):
+        """Старые события весят меньше свежих."""
+        now = timezone.now()
+        fresh = trending.event_score(now, 1)
+        old = trending.event_score(now - timedelta(days=1), 1)
+        self.assertAlmostEqual(fresh - old, 0.693, places=3)
+
+    def test_rebuild_matches_incremental_scores(self):
+        """Пакетный пересчёт даёт те же рейтинги, что и инкрементальный."""
+        post = self.create_post(group=TrendingTests.group)
+        self.comment(post, 2)
+        incremental = PostScore.objects.get(post=post).score
+        call_command('rebuild_trending', stdout=StringIO())
+        self.assertAlmostEqual(
+            PostScore.objects.get(post=post).score, incremental, places=6
+        )
+
+    def test_trending_page(self):
+        """Страница популярного показывает записи из рейтинга."""
+        post = self.create_post(group=TrendingTests.group)
+        response = self.guest_client.get(reverse('posts:trending'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn(post, response.context['posts'])
+        self.assertIn(TrendingTests.group, response.context['groups'])
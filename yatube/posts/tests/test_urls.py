@@ -2,7 +2,7 @@ from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.test import Client, TestCase
+from django.test import AsyncClient, Client, TestCase
 
 from ..models import Group, Post
 
@@ -83,3 +83,13 @@ class PostURLTests(TestCase):
             with self.subTest(url=url):
                 response = self.authorized_client.get(url)
                 self.assertTemplateUsed(response, template)
+
+    async def test_read_views_served_asynchronously(self):
+        """Ленты и страница поста отдаются асинхронным клиентом."""
+        client = AsyncClient()
+        for url, _ in self.public_urls_templates + (
+            (f"/posts/{self.post.id}/", "posts/post_detail.html"),
+        ):
+            with self.subTest(url=url):
+                response = await client.get(url)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
@@ -1,5 +1,7 @@
 import shutil
 import tempfile
+from io import BytesIO
+from unittest import mock
 
 from django import forms
 from django.conf import settings
@@ -8,6 +10,9 @@ from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
+from PIL import Image
+
+from core import images
 
 from ..models import Follow, Group, Post
 
@@ -158,6 +163,47 @@ class PostViewsTests(TestCase):
                         len(response.context['page_obj'].object_list), count
                     )
 
+    def test_paginator_renders_window_of_pages(self):
+        """Паджинатор выводит окно страниц, а не все страницы подряд."""
+        Post.objects.bulk_create(
+            Post(author=PostViewsTests.user, text='Тестовый пост')
+            for _ in range(300)
+        )
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': 'auth'}),
+            {'page': 15, 'q': 'x'},
+        )
+        content = response.content.decode()
+        num_pages = response.context['page_obj'].paginator.num_pages
+        self.assertEqual(content.count('class="page-item"'), 8)
+        self.assertEqual(content.count('…'), 2)
+        for page in (1, 13, 14, 16, 17, num_pages):
+            with self.subTest(page=page):
+                self.assertIn(f'href="?page={page}&amp;q=x"', content)
+        self.assertNotIn('page=12&amp;', content)
+
+    @override_settings(
+        POSTS_PER_PAGE={'default': 10, 'profile': 4}, POSTS_PER_PAGE_MAX=20
+    )
+    def test_page_size_per_view_and_limit(self):
+        """Размер страницы задаётся для view и через ?limit= с потолком."""
+        Post.objects.bulk_create(
+            Post(author=PostViewsTests.user, text='Тестовый пост')
+            for _ in range(30)
+        )
+        url = reverse('posts:profile', kwargs={'username': 'auth'})
+        cases = (
+            ({}, 4),
+            ({'limit': 7}, 7),
+            ({'limit': 10 ** 9}, 20),
+            ({'limit': 0}, 1),
+            ({'limit': 'много'}, 4),
+        )
+        for params, count in cases:
+            with self.subTest(params=params):
+                response = self.authorized_client.get(url, params)
+                self.assertEqual(len(response.context['page_obj']), count)
+
     def test_post_not_included_in_group(self):
         """Пост не принадлежит другой группе."""
         response = self.authorized_client.get(
@@ -171,6 +217,47 @@ class PostViewsTests(TestCase):
         post_group = post_object.group.pk
         self.assertNotEqual(post_group, group_2.pk)
 
+    def test_post_image_rendered_with_srcset(self):
+        """Картинка поста выводится набором вариантов через srcset."""
+        post = Post.objects.create(
+            author=PostViewsTests.user,
+            text='пост с картинкой',
+            image=SimpleUploadedFile(
+                name='srcset.gif',
+                content=self.small_gif,
+                content_type='image/gif'
+            )
+        )
+        response = self.guest_client.get(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+        content = response.content.decode()
+        self.assertIn('srcset=', content)
+        self.assertIn('sizes=', content)
+        self.assertIn(' 320w', content)
+
+    def test_image_variants_read_source_size_once(self):
+        """Размер исходника читается из kvstore один раз на картинку."""
+        content = BytesIO()
+        Image.new('RGB', (1000, 400)).save(content, 'PNG')
+        post = Post.objects.create(
+            author=PostViewsTests.user,
+            text='пост с большой картинкой',
+            image=SimpleUploadedFile(
+                name='large.png',
+                content=content.getvalue(),
+                content_type='image/png'
+            )
+        )
+        with mock.patch.object(
+            images, '_source_width', wraps=images._source_width
+        ) as source_width:
+            variants = images.image_variants(post.image)
+        self.assertEqual(
+            [width for width, _ in variants], [320, 640, 960]
+        )
+        source_width.assert_called_once()
+
     def test_cache_index(self):
         """Работает кэш на главной странице."""
         cache.clear()
@@ -0,0 +1,165 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Comment, GroupScore, Post, PostScore
+
+# Точка отсчёта для хранимых рейтингов. Рейтинг события равен
+# log(вес) + (время события - EPOCH) / tau, а сумма событий - logaddexp
+# их рейтингов. Сравнение таких сумм в любой момент даёт тот же порядок,
+# что и сравнение честно затухающих сумм.
+EPOCH = datetime(2022, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def decay_seconds():
+    return settings.TRENDING_HALF_LIFE.total_seconds() / math.log(2)
+
+
+def event_score(when, weight):
+    return math.log(weight) + (when - EPOCH).total_seconds() / decay_seconds()
+
+
+def logaddexp(first, second):
+    high, low = max(first, second), min(first, second)
+    return high + math.log1p(math.exp(low - high))
+
+
+def _bump(model, key, value):
+    with transaction.atomic():
+        row, created = model.objects.select_for_update().get_or_create(
+            defaults={"score": value}, **key
+        )
+        if not created:
+            row.score = logaddexp(row.score, value)
+            row.save(update_fields=("score",))
+
+
+def record_post(post):
+    """Учитывает новую запись в рейтингах записи и её группы."""
+    when = post.pub_date
+    _bump(
+        PostScore,
+        {"post_id": post.pk},
+        event_score(when, settings.TRENDING_POST_WEIGHT),
+    )
+    if post.group_id:
+        _bump(
+            GroupScore,
+            {"group_id": post.group_id},
+            event_score(when, settings.TRENDING_GROUP_POST_WEIGHT),
+        )
+
+
+def record_comment(comment):
+    """Учитывает новый комментарий в рейтингах записи и её группы."""
+    when = comment.created
+    _bump(
+        PostScore,
+        {"post_id": comment.post_id},
+        event_score(when, settings.TRENDING_COMMENT_WEIGHT),
+    )
+    group_id = comment.post.group_id
+    if group_id:
+        _bump(
+            GroupScore,
+            {"group_id": group_id},
+            event_score(when, settings.TRENDING_GROUP_COMMENT_WEIGHT),
+        )
+
+
+class DecayedSums:
+    """Копит затухающие суммы относительно момента now.
+
+    Все слагаемые не больше своего веса, поэтому переполнения нет, а в
+    хранимую шкалу сумма переводится одним сдвигом в scores().
+    """
+
+    def __init__(self, now):
+        self.now = now
+        self.tau = decay_seconds()
+        self.sums = defaultdict(float)
+
+    def add(self, key, when, weight):
+        age = (self.now - when).total_seconds()
+        self.sums[key] += weight * math.exp(-age / self.tau)
+
+    def scores(self):
+        shift = (self.now - EPOCH).total_seconds() / self.tau
+        return {
+            key: math.log(value) + shift
+            for key, value in self.sums.items()
+            if value > 0
+        }
+
+
+def rebuild(batch_size=1000):
+    """Пересчитывает рейтинги по записям и комментариям за последние
+    TRENDING_WINDOW. Строки за пределами окна удаляются, чтобы таблицы
+    оставались маленькими. Возвращает число записей и групп в рейтинге."""
+    now = timezone.now()
+    since = now - settings.TRENDING_WINDOW
+    posts = DecayedSums(now)
+    groups = DecayedSums(now)
+    recent_posts = Post.objects.filter(pub_date__gte=since).order_by()
+    for post_id, group_id, pub_date in recent_posts.values_list(
+        "id", "group_id", "pub_date"
+    ).iterator(chunk_size=batch_size):
+        posts.add(post_id, pub_date, settings.TRENDING_POST_WEIGHT)
+        if group_id:
+            groups.add(group_id, pub_date, settings.TRENDING_GROUP_POST_WEIGHT)
+    recent_comments = Comment.objects.filter(
+        created__gte=since, post__status=Post.PUBLISHED
+    ).order_by()
+    for post_id, group_id, created in recent_comments.values_list(
+        "post_id", "post__group_id", "created"
+    ).iterator(chunk_size=batch_size):
+        posts.add(post_id, created, settings.TRENDING_COMMENT_WEIGHT)
+        if group_id:
+            groups.add(
+                group_id, created, settings.TRENDING_GROUP_COMMENT_WEIGHT
+            )
+    post_scores = posts.scores()
+    group_scores = groups.scores()
+    with transaction.atomic():
+        PostScore.objects.all().delete()
+        PostScore.objects.bulk_create(
+            (PostScore(post_id=key, score=value)
+             for key, value in post_scores.items()),
+            batch_size=batch_size,
+        )
+        GroupScore.objects.all().delete()
+        GroupScore.objects.bulk_create(
+            (GroupScore(group_id=key, score=value)
+             for key, value in group_scores.items()),
+            batch_size=batch_size,
+        )
+    return len(post_scores), len(group_scores)
+
+
+def rebuild_groups(group_ids):
+    """Пересчитывает рейтинги групп group_ids, например после переноса
+    записей в обход save()."""
+    now = timezone.now()
+    since = now - settings.TRENDING_WINDOW
+    groups = DecayedSums(now)
+    for group_id, pub_date in Post.objects.filter(
+        group_id__in=group_ids, pub_date__gte=since
+    ).values_list("group_id", "pub_date"):
+        groups.add(group_id, pub_date, settings.TRENDING_GROUP_POST_WEIGHT)
+    for group_id, created in Comment.objects.filter(
+        post__group_id__in=group_ids,
+        post__status=Post.PUBLISHED,
+        created__gte=since,
+    ).values_list("post__group_id", "created"):
+        groups.add(group_id, created, settings.TRENDING_GROUP_COMMENT_WEIGHT)
+    scores = groups.scores()
+    with transaction.atomic():
+        GroupScore.objects.filter(group_id__in=group_ids).delete()
+        GroupScore.objects.bulk_create(
+            GroupScore(group_id=key, score=value)
+            for key, value in scores.items()
+        )
@@ -1,21 +1,56 @@
+import re
+
+from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
 from django.views.decorators.cache import cache_page
 
-from .forms import CommentForm, PostForm
-from .models import Comment, Follow, Group, Post, User
+from core import jobs
+from core.concurrency import async_view
+from core.images import precompute_variants
+
+from . import deletion, history, live, profiles, spam, stats, suggestions
+from .forms import CommentForm, PostForm, PublicationForm
+from .models import (Comment, Follow, FollowSuggestion, Group, GroupScore,
+                     Post, PostScore, Tag)
+
+# Ленты выводят готовый preview, полный текст им не нужен.
+FULL_TEXT = ("text", "text_html")
 
-COUNT_POSTS = 10
+
+def paginate(request, object_list, view):
+    """Страница ленты с размером из настроек или из ?limit=.
+
+    Размер ограничен POSTS_PER_PAGE_MAX, так что запрос к базе всегда
+    остаётся LIMIT/OFFSET на одну страницу.
+    """
+    per_page = settings.POSTS_PER_PAGE.get(
+        view, settings.POSTS_PER_PAGE["default"]
+    )
+    try:
+        per_page = int(request.GET["limit"])
+    except (KeyError, ValueError):
+        pass
+    per_page = max(1, min(per_page, settings.POSTS_PER_PAGE_MAX))
+    paginator = Paginator(object_list, per_page)
+    return paginator.get_page(request.GET.get("page"))
 
 
+@async_view
 @cache_page(20)
 def index(request):
     template = "posts/index.html"
-    post_list = Post.objects.select_related("group")
-    paginator = Paginator(post_list, COUNT_POSTS)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    post_list = Post.objects.without_duplicates().select_related(
+        "author", "group"
+    ).defer(*FULL_TEXT)
+    page_obj = paginate(request, post_list, "index")
 
     context = {
         "page_obj": page_obj,
@@ -23,12 +58,32 @@ def index(request):
     return render(request, template, context)
 
 
+@async_view
+def trending(request):
+    template = "posts/trending.html"
+    scores = PostScore.objects.filter(
+        post__status=Post.PUBLISHED
+    ).select_related("post__author", "post__group").defer(
+        *(f"post__{name}" for name in FULL_TEXT)
+    )[:settings.TRENDING_POSTS]
+    groups = GroupScore.objects.select_related("group")[
+        :settings.TRENDING_GROUPS
+    ]
+    context = {
+        "posts": [score.post for score in scores],
+        "groups": [score.group for score in groups],
+    }
+    return render(request, template, context)
+
+
+@async_view
 def group_posts(request, slug):
     template = "posts/group_list.html"
     group = get_object_or_404(Group, slug=slug)
-    paginator = Paginator(group.posts.all(), COUNT_POSTS)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    post_list = group.posts.without_duplicates(group).select_related(
+        "author"
+    ).defer(*FULL_TEXT)
+    page_obj = paginate(request, post_list, "group_posts")
     context = {
         "group": group,
         "page_obj": page_obj,
@@ -36,28 +91,59 @@ def group_posts(request, slug):
     return render(request, template, context)
 
 
+@async_view
+def tag_posts(request, name):
+    template = "posts/tag_list.html"
+    tag = get_object_or_404(Tag, name=name.lower())
+    # Сортировка по дате из ссылки на тег читает индекс (tag, -pub_date).
+    post_list = Post.objects.filter(tag_links__tag=tag).order_by(
+        "-tag_links__pub_date"
+    ).select_related("author", "group").defer(*FULL_TEXT)
+    page_obj = paginate(request, post_list, "tag_posts")
+    context = {
+        "tag": tag,
+        "page_obj": page_obj,
+    }
+    return render(request, template, context)
+
+
+@async_view
 def profile(request, username):
     template = "posts/profile.html"
-    author = get_object_or_404(User, username=username)
-    post_list = author.posts.all()
-    paginator = Paginator(post_list, COUNT_POSTS)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    author = profiles.get_user(username)
+    post_list = author.posts.defer(*FULL_TEXT)
+    page_obj = paginate(request, post_list, "profile")
     following = False
     if request.user.is_authenticated and author != request.user:
         following = author.following.filter(user=request.user).exists()
+    drafts = ()
+    if author == request.user:
+        drafts = Post.all_objects.filter(
+            author=author, status__in=(Post.DRAFT, Post.SCHEDULED)
+        ).order_by("publish_at")
     context = {
         "author": author,
         "page_obj": page_obj,
         "following": following,
+        "drafts": drafts,
+        "stats": stats.profile_stats(author.pk),
     }
     return render(request, template, context)
 
 
+@async_view
 def post_detail(request, post_id):
     template = "posts/post_detail.html"
-    post = get_object_or_404(Post.objects.select_related("author"), id=post_id)
-    comments = Comment.objects.filter(post_id=post_id)
+    post = get_object_or_404(
+        Post.all_objects.exclude(status=Post.DELETED), id=post_id
+    )
+    post.author = profiles.get_user(user_id=post.author_id)
+    # Черновики и отложенные записи видны только автору.
+    if not post.is_published and post.author != request.user:
+        raise Http404
+    comments = Comment.objects.filter(post_id=post_id).select_related(
+        "author"
+    )
     form = CommentForm(request.POST or None)
     context = {
         "post": post,
@@ -67,6 +153,26 @@ def post_detail(request, post_id):
     return render(request, template, context)
 
 
+@async_view
+def post_history(request, post_id):
+    template = "posts/post_history.html"
+    post = get_object_or_404(Post, id=post_id)
+    revisions = post.revisions.defer("data")
+    number = request.GET.get("rev")
+    text = None
+    # Только ASCII-цифры: int() принимает и другие, а длинное число не
+    # помещается в запрос.
+    if number and re.fullmatch(r"[0-9]{1,9}", number):
+        text = history.revision_text(post, int(number))
+    context = {
+        "post": post,
+        "revisions": revisions,
+        "number": number,
+        "text": text,
+    }
+    return render(request, template, context)
+
+
 @login_required
 def post_create(request):
     template = "posts/create_post.html"
@@ -74,39 +180,99 @@ def post_create(request):
         request.POST or None,
         files=request.FILES or None,
     )
-    if form.is_valid():
+    publication_form = PublicationForm(request.POST or None)
+    if form.is_valid() and publication_form.is_valid():
         post = form.save(commit=False)
         post.author = request.user
+        publication_form.apply(post)
+        verdict = spam.screen(post)
         post.save()
+        spam.defer(post, verdict)
+        if verdict.is_spam:
+            messages.warning(request, "Запись отправлена на проверку.")
+        if post.image:
+            jobs.enqueue(precompute_variants, post.image.name)
         return redirect("posts:profile", username=request.user)
-    return render(request, template, {"form": form})
+    context = {
+        "form": form,
+        "publication_form": publication_form,
+    }
+    return render(request, template, context)
 
 
 @login_required
-def post_delete(request,post_id):
-    post = Post.objects.get(id=post_id)
-    post.delete()
+def post_delete(request, post_id):
+    post = get_object_or_404(
+        Post.all_objects.exclude(status=Post.DELETED),
+        id=post_id,
+        author=request.user,
+    )
+    deletion.soft_delete(post)
+    if post.pk is None:
+        return redirect("posts:profile", username=request.user)
+    messages.info(
+        request,
+        format_html(
+            'Запись удалена. <a href="{}">Восстановить</a>',
+            reverse("posts:post_restore", args=(post.pk,)),
+        ),
+    )
     return redirect("posts:profile", username=request.user)
 
 
+@login_required
+def post_restore(request, post_id):
+    post = get_object_or_404(
+        Post.all_objects,
+        id=post_id,
+        author=request.user,
+        status=Post.DELETED,
+        deleted_at__gte=timezone.now() - settings.POST_RESTORE_WINDOW,
+    )
+    deletion.restore(post)
+    return redirect(post)
+
+
 @login_required
 def post_edit(request, post_id):
     template = "posts/create_post.html"
-    post = get_object_or_404(Post, id=post_id)
+    # Запись, отмеченную как спам, автор не может опубликовать правкой.
+    post = get_object_or_404(
+        Post.all_objects.exclude(status__in=(Post.DELETED, Post.SPAM)),
+        id=post_id,
+    )
     if post.author != request.user:
         return redirect("posts:post_detail", post_id)
+    publication_form = None
     if request.method == "POST":
+        old_text, old_image = post.text, post.image.name or ""
         form = PostForm(
             request.POST or None,
             files=request.FILES or None,
             instance=post
         )
-        if form.is_valid():
+        if not post.is_published:
+            publication_form = PublicationForm(request.POST, instance=post)
+        if form.is_valid() and (
+            publication_form is None or publication_form.is_valid()
+        ):
+            if publication_form is not None:
+                publication_form.apply(post)
+            verdict = spam.screen(post)
             form.save()
+            spam.defer(post, verdict)
+            history.record_edit(post, old_text, old_image)
+            if verdict.is_spam:
+                messages.warning(request, "Запись отправлена на проверку.")
+            if "image" in form.changed_data and post.image:
+                jobs.enqueue(precompute_variants, post.image.name)
             return redirect(post)
     form = PostForm(instance=post)
+    if not post.is_published:
+        publication_form = PublicationForm(instance=post)
     context = {
         "form": form,
+        "publication_form": publication_form,
         "is_edit": True,
     }
     return render(request, template, context)
@@ -120,38 +286,62 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
+        verdict = spam.screen(comment)
         comment.save()
+        spam.defer(comment, verdict)
+        if verdict.is_spam:
+            messages.warning(request, "Комментарий отправлен на проверку.")
     return redirect(post)
 
 
+@async_view
 @login_required
 def follow_index(request):
     template = "posts/follow.html"
     authors_ids = Follow.objects.filter(
         user=request.user).values_list('author_id', flat=True)
-    posts = Post.objects.filter(author_id__in=authors_ids)
-    paginator = Paginator(posts, COUNT_POSTS)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    posts = Post.objects.filter(author_id__in=authors_ids).select_related(
+        "author", "group"
+    ).defer(*FULL_TEXT)
+    page_obj = paginate(request, posts, "follow_index")
     context = {
         "page_obj": page_obj,
+        "suggestions": FollowSuggestion.objects.filter(
+            user=request.user
+        ).select_related("author")[:settings.SUGGESTIONS_SHOWN],
     }
     return render(request, template, context)
 
 
 @login_required
 def profile_follow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = profiles.get_user(username)
     if author != request.user:
         Follow.objects.get_or_create(user=request.user, author=author)
+        jobs.enqueue(suggestions.refresh, request.user.pk)
     return redirect("posts:profile", author)
 
 
 @login_required
 def profile_unfollow(request, username):
-    author = get_object_or_404(User, username=username)
+    author = profiles.get_user(username)
     user_follow = get_object_or_404(Follow.objects,
                                     user=request.user,
                                     author=author)
     user_follow.delete()
+    jobs.enqueue(suggestions.refresh, request.user.pk)
     return redirect("posts:profile", author)
+
+
+def live_feed(request):
+    """Уведомления о новых записях в формате server-sent events.
+
+    Под ASGI этот путь обслуживает posts.live.sse_application. Под WSGI
+    поток занял бы рабочий поток на всё время соединения, поэтому здесь
+    сразу отвечаем 204: на него EventSource больше не переподключается.
+    """
+    try:
+        live.feed_filter(request)
+    except PermissionDenied:
+        return HttpResponseForbidden()
+    return HttpResponse(status=204)
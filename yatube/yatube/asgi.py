@@ -0,0 +1,30 @@
+import os
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "yatube.settings")
+os.environ["DJANGO_SERVER_INTERFACE"] = "asgi"
+
+django_application = get_asgi_application()
+
+from django.urls import reverse  # noqa: E402
+
+from core.template_cache import warm_up  # noqa: E402
+from posts.live import sse_application  # noqa: E402
+
+LIVE_FEED_PATH = reverse("posts:live_feed")
+
+warm_up()
+
+
+async def application(scope, receive, send):
+    # Поток событий держит соединение долго, поэтому обслуживается
+    # асинхронно в обход синхронных middleware Django.
+    if scope["type"] == "http" and scope["path"] == LIVE_FEED_PATH:
+        await sse_application(scope, receive, send)
+        return
+    # Каждый запрос получает свой поток для работы с базой, иначе Django 3.2
+    # выполняет все синхронные вызовы в одном общем потоке.
+    async with ThreadSensitiveContext():
+        await django_application(scope, receive, send)
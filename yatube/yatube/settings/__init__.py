@@ -0,0 +1,8 @@
+import os
+
+# Профиль настроек выбирается переменной окружения DJANGO_ENV:
+# dev (по умолчанию) или prod.
+if os.environ.get("DJANGO_ENV", "dev") == "prod":
+    from .prod import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
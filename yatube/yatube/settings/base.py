@@ -0,0 +1,253 @@
+import os
+from datetime import timedelta
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+    'www.permyakoff.pythonanywhere.com',
+    'permyakoff.pythonanywhere.com',
+]
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "posts.apps.PostsConfig",
+    "users.apps.UsersConfig",
+    "core.apps.CoreConfig",
+    "about.apps.AboutConfig",
+    "sorl.thumbnail",
+]
+
+MIDDLEWARE = [
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+ROOT_URLCONF = "yatube.urls"
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, "templates")
+TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [TEMPLATES_DIR],
+        "OPTIONS": {
+            # Кэширующий загрузчик разбирает каждый шаблон один раз за
+            # жизнь процесса; в профиле dev он выключен.
+            "loaders": [
+                ("django.template.loaders.cached.Loader", TEMPLATE_LOADERS)
+            ],
+            "context_processors": [
+                "django.template.context_processors.debug",
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+                "core.context_processors.year.year",
+                "core.context_processors.live_feed.live_feed",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "yatube.wsgi.application"
+ASGI_APPLICATION = "yatube.asgi.application"
+ASYNC_DB_CONCURRENCY = 32
+# yatube/asgi.py выставляет "asgi" до загрузки настроек.
+SERVER_INTERFACE = os.environ.get("DJANGO_SERVER_INTERFACE", "wsgi")
+
+# Живая лента держит соединение открытым. Под WSGI это занятый поток на
+# каждую вкладку, поэтому она включается только при запуске через ASGI.
+LIVE_FEED_ENABLED = SERVER_INTERFACE == "asgi"
+LIVE_FEED_POLL_INTERVAL = 2
+LIVE_FEED_POLL_LAG = timedelta(minutes=2)
+LIVE_FEED_HEARTBEAT = 15
+
+TRENDING_HALF_LIFE = timedelta(hours=24)
+TRENDING_WINDOW = timedelta(days=7)
+TRENDING_POST_WEIGHT = 1
+TRENDING_COMMENT_WEIGHT = 2
+TRENDING_GROUP_POST_WEIGHT = 1
+TRENDING_GROUP_COMMENT_WEIGHT = 0.5
+TRENDING_POSTS = 20
+TRENDING_GROUPS = 10
+
+SUGGESTIONS_LIMIT = 10
+SUGGESTIONS_FANOUT = 200
+SUGGESTIONS_FRIENDS_WEIGHT = 1
+SUGGESTIONS_SIMILAR_WEIGHT = 1
+SUGGESTIONS_BATCH_SIZE = 1000
+SUGGESTIONS_SHOWN = 5
+
+POST_RESTORE_WINDOW = timedelta(days=1)
+POST_PURGE_BATCH_SIZE = 100
+POST_HISTORY_SNAPSHOT_EVERY = 10
+POST_PREVIEW_LENGTH = 300
+
+PAGINATOR_ON_EACH_SIDE = 2
+PAGINATOR_ON_ENDS = 1
+PAGINATOR_COUNT_TIMEOUT = 60
+PAGINATOR_COUNT_THRESHOLD = 10000
+
+POSTS_PER_PAGE = {
+    "default": 10,
+}
+POSTS_PER_PAGE_MAX = 100
+
+USER_SUMMARY_CACHE = "users"
+USER_SUMMARY_TIMEOUT = 300
+
+PROFILE_STATS_MONTHS = 12
+PROFILE_STATS_HEATMAP_WEEKS = 26
+
+# Проверки на спам: пути функций, выполняемых в запросе, пока не истёк
+# бюджет (в секундах), и тех, что всегда идут в очередь задач.
+SPAM_CHECKS = (
+    "posts.spam.blocked_words",
+    "posts.spam.links",
+    "posts.spam.velocity",
+    "posts.spam.duplicates",
+)
+# При правке записи частота и повторы не проверяются: иначе несколько
+# исправлений одной записи сами сделали бы её спамом.
+SPAM_EDIT_CHECKS = (
+    "posts.spam.blocked_words",
+    "posts.spam.links",
+)
+SPAM_BACKGROUND_CHECKS = ("posts.spam.author_history",)
+SPAM_TIME_BUDGET = 0.05
+SPAM_THRESHOLD = 1
+SPAM_CACHE = "default"
+SPAM_BLOCKED_WORDS = ()
+SPAM_LINKS_ALLOWED = 2
+SPAM_LINK_WEIGHT = 0.25
+SPAM_VELOCITY_WINDOW = timedelta(minutes=10)
+SPAM_VELOCITY_LIMITS = {"post": 10, "comment": 30}
+SPAM_VELOCITY_WEIGHT = 0.2
+SPAM_DUPLICATE_WINDOW = timedelta(hours=1)
+SPAM_DUPLICATE_MIN_SHINGLES = 5
+SPAM_DUPLICATES_ALLOWED = 2
+SPAM_DUPLICATE_WEIGHT = 0.5
+SPAM_DUPLICATE_BUCKET_SIZE = 50
+SPAM_HISTORY_WINDOW = timedelta(days=7)
+SPAM_HISTORY_WEIGHT = 0.5
+
+# MinHash: n-граммы из слов, число хеш-функций и полос LSH.
+SIMILARITY_NGRAM = 3
+SIMILARITY_PERMUTATIONS = 64
+SIMILARITY_BANDS = 16
+# Повторами считаются записи автора с оценкой сходства не ниже порога.
+DUPLICATE_THRESHOLD = 0.8
+DUPLICATE_CANDIDATES = 200
+DUPLICATE_BATCH_SIZE = 500
+
+JOBS_BATCH_SIZE = 10
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = timedelta(seconds=30)
+JOBS_RETRY_MAX_DELAY = timedelta(hours=1)
+JOBS_LOCK_TIMEOUT = timedelta(minutes=10)
+
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+    }
+}
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation"
+                ".UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation" ".MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation" ".CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation" ".NumericPasswordValidator",
+    },
+]
+
+LANGUAGE_CODE = "ru"
+
+TIME_ZONE = "UTC"
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+STATIC_URL = "/static/"
+STATIC_ROOT = os.path.join(BASE_DIR, "collected_static")
+# Отдавать собранную статику из Django, если перед ним нет веб-сервера.
+STATIC_SERVE = False
+STATIC_MAX_AGE = 60 * 60
+STATIC_HASHED_MAX_AGE = 365 * 24 * 60 * 60
+STATIC_COMPRESS_EXTENSIONS = (
+    ".css", ".js", ".svg", ".html", ".txt", ".json", ".xml", ".ico", ".map"
+)
+STATIC_COMPRESS_MIN_SIZE = 256
+
+# Уровень 5 почти не уступает 9 в размере HTML, но заметно быстрее.
+GZIP_LEVEL = 5
+GZIP_MIN_LENGTH = 200
+GZIP_EXCLUDED_TYPES = ("image/", "video/", "audio/", "text/event-stream")
+
+# Адрес сайта для ссылок в письмах.
+SITE_URL = "http://127.0.0.1:8000"
+
+LOGIN_URL = "users:login"
+LOGIN_REDIRECT_URL = "posts:index"
+# LOGOUT_REDIRECT_URL = "posts:index"
+
+
+EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, "sent_emails")
+
+CSRF_FAILURE_VIEW = "core.views.csrf_failure"
+
+MEDIA_URL = "/media/"
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+MEDIA_MAX_AGE = 7 * 24 * 60 * 60
+# "X-Accel-Redirect" для nginx или "X-Sendfile" для Apache: тогда файлы
+# отправляет веб-сервер, а Django только проверяет путь и заголовки.
+MEDIA_SENDFILE_HEADER = None
+# internal-location nginx, смотрящий в MEDIA_ROOT.
+MEDIA_ACCEL_REDIRECT_PREFIX = "/internal-media/"
+
+# Сессии читаются из кэша, в БД идёт только запись и промахи. Без
+# серверного хранения: "django.contrib.sessions.backends.signed_cookies".
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
+SESSION_CLEANUP_BATCH_SIZE = 1000
+
+POST_IMAGE_WIDTHS = (320, 640, 960, 1920)
+POST_IMAGE_DEFAULT_WIDTH = 960
+POST_IMAGE_RATIO = (960, 339)
+POST_IMAGE_QUALITY = 80
+POST_IMAGE_SIZES = "(max-width: 960px) 100vw, 960px"
@@ -0,0 +1,38 @@
+import os
+
+from .base import *  # noqa: F401,F403
+
+SECRET_KEY = os.environ.get(
+    "SECRET_KEY", "ow4hr8bp+40)=q7$0u3mwu1neu6=3)*s@-$^67)4fie_a#i2o0"
+)
+
+DEBUG = True
+
+INSTALLED_APPS += ["debug_toolbar"]
+
+MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
+
+# Правки шаблонов видны без перезапуска. Загрузчики заданы явно, а не
+# через APP_DIRS: с ним Django 3.2 включает кэш, как только DEBUG
+# выключен, например в тестах. Шаблоны debug_toolbar находит
+# app_directories.Loader, так что его проверка APP_DIRS лишняя.
+TEMPLATES[0]["OPTIONS"]["loaders"] = TEMPLATE_LOADERS
+SILENCED_SYSTEM_CHECKS = ["debug_toolbar.W006"]
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+    },
+    'users': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'users',
+    },
+}
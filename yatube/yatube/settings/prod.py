@@ -0,0 +1,50 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+
+try:
+    SECRET_KEY = os.environ["SECRET_KEY"]
+except KeyError:
+    raise ImproperlyConfigured("Задайте SECRET_KEY в окружении")
+
+DEBUG = False
+
+if "ALLOWED_HOSTS" in os.environ:
+    ALLOWED_HOSTS = os.environ["ALLOWED_HOSTS"].split(",")
+
+# Сжатие и условные ответы стоят сразу за SecurityMiddleware, чтобы видеть
+# окончательное тело ответа. ETag считается по несжатому телу.
+MIDDLEWARE = MIDDLEWARE[:1] + [
+    "core.middleware.GZipMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
+] + MIDDLEWARE[1:]
+
+SITE_URL = os.environ.get("SITE_URL", SITE_URL)
+
+STATICFILES_STORAGE = "core.storage.CompressedManifestStaticFilesStorage"
+STATIC_SERVE = os.environ.get("STATIC_SERVE") == "1"
+MEDIA_SENDFILE_HEADER = os.environ.get("MEDIA_SENDFILE_HEADER") or None
+
+# Под ASGI каждый запрос работает с базой в новом потоке (см.
+# yatube/asgi.py), и постоянное соединение такого потока больше никто не
+# использует и не закрывает. Поэтому там соединения по умолчанию
+# закрываются в конце запроса.
+DATABASES["default"]["CONN_MAX_AGE"] = int(
+    os.environ.get(
+        "DB_CONN_MAX_AGE", 0 if SERVER_INTERFACE == "asgi" else 600
+    )
+)
+
+# Кэш общий для всех процессов: иначе сброс сводки пользователя или выход
+# из сессии в одном процессе не виден в остальных.
+CACHE_LOCATION = os.environ.get("CACHE_LOCATION", "127.0.0.1:11211")
+CACHES = {
+    alias: {
+        "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+        "LOCATION": CACHE_LOCATION,
+        "KEY_PREFIX": alias,
+    }
+    for alias in ("default", "sessions", "users")
+}
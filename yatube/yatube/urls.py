@@ -1,8 +1,9 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from core.views import media_file, static_file
+
 
 handler403 = "core.views.csrf_failure"
 handler404 = "core.views.page_not_found"
@@ -15,9 +16,13 @@ urlpatterns = [
     path("auth/", include("django.contrib.auth.urls")),
     path("about/", include("about.urls", namespace="about")),
 ]
-if settings.DEBUG:
-    import debug_toolbar
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
+if settings.STATIC_SERVE:
+    urlpatterns += (
+        path(f"{settings.STATIC_URL.strip('/')}/<path:path>", static_file),
     )
+urlpatterns += (
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", media_file),
+)
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    import debug_toolbar
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)